@@ -0,0 +1,168 @@
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+
+# Append-only binary log of every answer, for response-time analysis.
+# The file is a 4-byte magic followed by fixed-width little-endian records:
+#   stage code, answer (0 = no, 1 = yes, 2 = none), correct, pad,
+#   frames elapsed, first color, second color (0 if none), wall-clock timestamp
+# Stage codes are given out by each AnswerLog as it meets new stage names (the packs' results names).
+# Every batch written starts with a name record for each code in it: the code, answer NAME_MARK and
+# the name's length in frames, followed by the UTF-8 name padded to whole records. Several processes
+# can append to one file, each with its own codes, since a batch always carries its own names.
+MAGIC = b"CGA1"
+RECORD = struct.Struct("<BBBxIIId")
+NAME_MARK = 3
+MAX_CODE = 255  # Stages met after this many are logged as 0, read back as "Unknown"
+
+# Codes used by logs written before the names were stored in the file
+LEGACY_STAGE_NAMES = {1: "ColorTheoryGame", 2: "ColorMixingGame", 3: "WarmCoolColorTheoryGame"}
+
+ANSWER_LOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "answers.log")
+
+AnswerRecord = namedtuple("AnswerRecord", "stage answer correct frames color color2 timestamp")
+
+
+def answer_log_path():
+    # COLOR_GAMES_ANSWERS=path logs somewhere else; worker processes inherit it from the dashboard
+    return os.environ.get("COLOR_GAMES_ANSWERS") or ANSWER_LOG_PATH
+
+
+def name_record(code, name):
+    encoded = name.encode()
+    padded = encoded.ljust(-(-len(encoded) // RECORD.size) * RECORD.size, b"\0")
+    return RECORD.pack(code, NAME_MARK, 0, len(encoded), 0, 0, 0.0) + padded
+
+
+class AnswerLog:
+    # Fixed-size ring buffer of packed records, drained to the log file in batches by a background
+    # thread. The frame loop only packs a record into memory; if the writer falls a whole buffer
+    # behind, the oldest unwritten records are overwritten and counted in dropped.
+    def __init__(self, path, capacity=4096, batch_size=256, flush_interval=1.0):
+        self.path = path
+        self.capacity = capacity
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.head = 0  # Oldest record not yet written
+        self.tail = 0  # Next record to fill
+        self.dropped = 0
+        self.codes = {}  # Stage name -> code in this log's records
+        self.names = {}  # Code -> stage name
+        self.lock = threading.Lock()  # Only held for an index update or one memory copy
+        self.wake = threading.Event()
+        self.closed = False
+        self.thread = None
+
+    def start(self):
+        # Open the file and listen to the stages in this process. game_host brings in Pyxel, so the
+        # dashboard only starts the log once a stage is launched; calling start again is harmless.
+        if self.thread is not None:
+            return self
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "ab") as log_file:
+                log_file.write(MAGIC)
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        import game_host
+        game_host.answer_listeners.append(self)
+        return self
+
+    def close(self):
+        if self.thread is None:
+            return  # Never started, so nothing is buffered or listening
+        import game_host
+        if self in game_host.answer_listeners:
+            game_host.answer_listeners.remove(self)
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+        return False
+
+    # Answer listener, called from the frame loop
+    def __call__(self, stage, colors, answer, correct, frames):
+        color2 = colors[1] if len(colors) > 1 else 0
+        with self.lock:
+            code = self.codes.get(stage)
+            if code is None:
+                code = self.codes[stage] = len(self.codes) + 1 if len(self.codes) < MAX_CODE else 0
+                self.names[code] = stage
+            offset = (self.tail % self.capacity) * RECORD.size
+            RECORD.pack_into(self.buffer, offset, code, 2 if answer is None else int(answer),
+                             int(correct), min(max(frames, 0), 0xffffffff), colors[0], color2, time.time())
+            self.tail += 1
+            if self.tail - self.head > self.capacity:
+                self.head = self.tail - self.capacity
+                self.dropped += 1
+            pending = self.tail - self.head
+        if pending >= self.batch_size:
+            self.wake.set()
+
+    def take_pending(self):
+        # Copy the unwritten records out of the ring in order and mark them written
+        with self.lock:
+            start, end = self.head, self.tail
+            first = (start % self.capacity) * RECORD.size
+            last = (end % self.capacity) * RECORD.size
+            if end - start == 0:
+                data = b""
+            elif first < last:
+                data = bytes(self.buffer[first:last])
+            else:
+                data = bytes(self.buffer[first:]) + bytes(self.buffer[:last])
+            self.head = end
+        return data
+
+    def flush(self):
+        data = self.take_pending()
+        if data:
+            # The stage code is each record's first byte; name them ahead of the records in one write
+            names = b"".join(name_record(code, self.names[code]) for code in sorted(set(data[::RECORD.size])) if code)
+            with open(self.path, "ab") as log_file:
+                log_file.write(names + data)
+
+    def run(self):
+        while not self.closed:
+            self.wake.wait(self.flush_interval)
+            self.wake.clear()
+            self.flush()
+        self.flush()
+
+
+def read_answers(path, chunk_records=4096):
+    # Stream the log back as AnswerRecord tuples without loading the whole file
+    with open(path, "rb") as log_file:
+        if log_file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an answer log")
+        names = dict(LEGACY_STAGE_NAMES)
+        carry = b""  # Start of a name record, or a torn record, left over from the last chunk
+        while True:
+            chunk = log_file.read(chunk_records * RECORD.size)
+            if not chunk:
+                return  # Anything still carried is a torn write at the end, and is ignored
+            chunk = carry + chunk
+            usable = len(chunk) - len(chunk) % RECORD.size
+            carry = chunk[usable:]
+            skip = 0
+            for index, (stage, answer, correct, frames, color, color2, timestamp) in enumerate(RECORD.iter_unpack(chunk[:usable])):
+                if skip:
+                    skip -= 1  # Part of the name before
+                elif answer == NAME_MARK:
+                    start = (index + 1) * RECORD.size
+                    skip = -(-frames // RECORD.size)
+                    if start + skip * RECORD.size > usable:
+                        carry = chunk[start - RECORD.size:]  # The name continues in the next chunk
+                        break
+                    names[stage] = chunk[start:start + frames].decode()
+                else:
+                    yield AnswerRecord(names.get(stage, "Unknown"), None if answer == 2 else bool(answer),
+                                       bool(correct), frames, color, color2, timestamp)
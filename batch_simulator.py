@@ -0,0 +1,245 @@
+import time
+
+import numpy as np
+
+import color_mixing_game
+import color_theory_game
+import headless
+import warm_cool_game
+from question_pool import question_pools
+
+# Vectorised simulator for synthetic learners. Session state is held as parallel NumPy arrays
+# (one entry per session) and every session is advanced by one frame per tick, using the same
+# screen tables the stages run on. Questions are drawn uniformly from the stage's pool; the
+# per-session spaced-repetition order of the live game is not modelled.
+
+# Stages that can be simulated: question pool key and the method that gives a question's answer
+STAGES = {
+    color_theory_game.ColorTheoryGame: ("color_theory", "is_primary_color"),
+    color_mixing_game.ColorMixingGame: ("color_mixing", "check_mixing"),
+    warm_cool_game.QuizGame: ("warm_cool", "is_warm_color"),
+}
+
+# Action codes for the compiled tables
+NOOP = 0
+DEAL = 1
+ANSWER = 2
+GUARD = 3  # Guards are numbered from here, in the order of GUARDS
+
+# Vectorised versions of the guard actions the tables use
+GUARDS = {
+    "quiz_complete": lambda simulation: simulation.success >= simulation.stage_class.QUIZ_TARGET,
+}
+
+# Actions that only touch timing or the window, which the simulator does not model
+IGNORED_ACTIONS = ("restart_timer",)
+
+CONTINUE_KEY = "C"
+
+
+def stage_questions(stage_class):
+    # The stage's question pool and the correct answer to each question, worked out by the stage itself
+    pool_key, answer_method = STAGES[stage_class]
+    game = headless.run_headless(stage_class, ())  # Builds the shared pool if it is not cached yet
+    pool = question_pools[pool_key]
+    answers = np.array([getattr(game, answer_method)(question) for question in pool], dtype=bool)
+    return pool, answers
+
+
+def action_code(stage_class, action):
+    if action is None or action in IGNORED_ACTIONS:
+        return NOOP, False
+    if action == "new_question":
+        return DEAL, False
+    if isinstance(action, tuple) and action[0] == "select_answer":
+        return ANSWER, action[1]
+    if action in GUARDS:
+        return GUARD + list(GUARDS).index(action), False
+    raise ValueError(f"{stage_class.__name__} action {action!r} cannot be simulated")
+
+
+class StageTables:
+    # A stage's TRANSITIONS and AUTO_TRANSITIONS compiled to lookup arrays indexed by screen.
+    # The simulated learner presses the answer keys on question screens and CONTINUE_KEY elsewhere.
+    def __init__(self, stage_class):
+        if stage_class.TICKS or stage_class.TIMERS:
+            raise ValueError(f"{stage_class.__name__} uses ticks or timers, which cannot be simulated")
+        screens = {*stage_class.TRANSITIONS, *stage_class.AUTO_TRANSITIONS, *stage_class.DRAW_HANDLERS}
+        for table in stage_class.TRANSITIONS.values():
+            screens.update(next_screen for _, next_screen in table.values())
+        screens.update(next_screen for _, next_screen in stage_class.AUTO_TRANSITIONS.values())
+        count = max(screens) + 1
+        screen_range = np.arange(count)
+
+        # Pressed-key transitions by column: 0 answers True, 1 answers False, 2 continues
+        self.answer_screen = np.zeros(count, dtype=bool)
+        self.next_screen = np.tile(screen_range[:, None], 3).astype(np.uint8)
+        self.action = np.zeros((count, 3), dtype=np.uint8)
+        for screen, table in stage_class.TRANSITIONS.items():
+            for key, (action, next_screen) in table.items():
+                code, value = action_code(stage_class, action)
+                if code == ANSWER:
+                    self.answer_screen[screen] = True
+                    column = 0 if value else 1
+                elif key == CONTINUE_KEY:
+                    column = 2
+                else:
+                    continue
+                self.next_screen[screen, column] = next_screen
+                self.action[screen, column] = code
+
+        # Automatic transitions, followed in the tick a screen is reached
+        self.has_auto = np.zeros(count, dtype=bool)
+        self.auto_next = screen_range.astype(np.uint8)
+        self.auto_action = np.zeros(count, dtype=np.uint8)
+        for screen, (action, next_screen) in stage_class.AUTO_TRANSITIONS.items():
+            self.has_auto[screen] = True
+            self.auto_next[screen] = next_screen
+            self.auto_action[screen] = action_code(stage_class, action)[0]
+        self.auto_depth = len(stage_class.AUTO_TRANSITIONS)
+
+        # Screens with no way out, such as ColorTheoryGame's finished screen
+        self.final_screen = np.ones(count, dtype=bool)
+        self.final_screen[list(stage_class.TRANSITIONS)] = False
+        self.final_screen[list(stage_class.AUTO_TRANSITIONS)] = False
+
+
+# Learner response models. respond() returns each session's answer (True/False) to its question;
+# record() is told whether each answer was correct, so a model can learn.
+class RandomLearner:
+    def respond(self, simulation, sessions, questions):
+        return simulation.rng.random(sessions.size) < 0.5
+
+    def record(self, simulation, sessions, questions, correct):
+        pass
+
+
+class AccuracyLearner(RandomLearner):
+    # Answers correctly with a fixed probability
+    def __init__(self, accuracy=0.8):
+        self.accuracy = accuracy
+
+    def respond(self, simulation, sessions, questions):
+        knows = simulation.rng.random(sessions.size) < self.accuracy
+        return knows == simulation.answers[questions]
+
+
+class PracticeLearner(RandomLearner):
+    # Keeps a mastery level per session and question, starting at zero (guessing). Every answer,
+    # right or wrong, moves mastery towards 1 by learning_rate, since the feedback screen shows the answer.
+    def __init__(self, learning_rate=0.2):
+        self.learning_rate = learning_rate
+        self.mastery = None
+
+    def respond(self, simulation, sessions, questions):
+        if self.mastery is None or self.mastery.shape != (simulation.sessions, len(simulation.pool)):
+            self.mastery = np.zeros((simulation.sessions, len(simulation.pool)), dtype=np.float32)
+        knows = simulation.rng.random(sessions.size, dtype=np.float32) < self.mastery[sessions, questions]
+        guesses = simulation.rng.random(sessions.size) < 0.5
+        return np.where(knows, simulation.answers[questions], guesses)
+
+    def record(self, simulation, sessions, questions, correct):
+        mastery = self.mastery[sessions, questions]
+        self.mastery[sessions, questions] = mastery + self.learning_rate * (1 - mastery)
+
+
+class BatchSimulation:
+    # Struct-of-arrays session state for many learners playing one stage
+    def __init__(self, stage_class, sessions, learner=None, seed=None):
+        self.stage_class = stage_class
+        self.sessions = sessions
+        self.learner = learner or AccuracyLearner()
+        self.rng = np.random.default_rng(seed)
+        self.tables = StageTables(stage_class)
+        self.pool, self.answers = stage_questions(stage_class)
+
+        self.screen = np.zeros(sessions, dtype=np.uint8)
+        self.question = self.rng.integers(len(self.pool), size=sessions, dtype=np.int32)  # Index into pool
+        self.success = np.zeros(sessions, dtype=np.int32)
+        self.failed = np.zeros(sessions, dtype=np.int32)
+        self.ticks = 0
+        self.answered = 0
+
+    def deal(self, sessions):
+        self.question[sessions] = self.rng.integers(len(self.pool), size=sessions.size, dtype=np.int32)
+
+    def tick(self):
+        # One frame for every session
+        tables = self.tables
+        screen = self.screen
+        column = np.full(self.sessions, 2, dtype=np.uint8)
+
+        answering = np.flatnonzero(tables.answer_screen[screen])
+        if answering.size:
+            questions = self.question[answering]
+            answers = self.learner.respond(self, answering, questions)
+            column[answering] = np.where(answers, 0, 1)
+            correct = answers == self.answers[questions]
+            self.success[answering] += correct
+            self.failed[answering] += ~correct
+            self.learner.record(self, answering, questions, correct)
+            self.answered += answering.size
+
+        action = tables.action[screen, column]
+        dealing = np.flatnonzero(action == DEAL)
+        if dealing.size:
+            self.deal(dealing)
+        next_screen = tables.next_screen[screen, column]
+
+        # Automatic transitions for the sessions that just reached a screen with one
+        moving = np.flatnonzero((next_screen != screen) & tables.has_auto[next_screen])
+        for _ in range(tables.auto_depth):
+            if not moving.size:
+                break
+            from_screen = next_screen[moving]
+            action = tables.auto_action[from_screen]
+            allowed = np.ones(moving.size, dtype=bool)
+            for code, guard in enumerate(GUARDS.values(), GUARD):
+                guarded = action == code
+                if guarded.any():
+                    allowed[guarded] = guard(self)[moving[guarded]]
+            dealing = moving[allowed & (action == DEAL)]
+            if dealing.size:
+                self.deal(dealing)
+            moving = moving[allowed]
+            next_screen[moving] = tables.auto_next[next_screen[moving]]
+            moving = moving[tables.has_auto[next_screen[moving]]]
+
+        self.screen = next_screen
+        self.ticks += 1
+
+    def run(self, ticks):
+        for _ in range(ticks):
+            self.tick()
+        return self
+
+    def summary(self):
+        answered = self.success + self.failed
+        total = int(answered.sum())
+        return {
+            "sessions": self.sessions,
+            "ticks": self.ticks,
+            "answers": total,
+            "accuracy": float(self.success.sum()) / total if total else 0.0,
+            "finished": float(self.tables.final_screen[self.screen].mean()),
+            "mean_success": float(self.success.mean()),
+            "mean_failed": float(self.failed.mean()),
+        }
+
+
+# Throughput check: simulated answers per second for every stage and learner model
+def main(sessions=100000, ticks=200):
+    learners = {"random": RandomLearner, "accuracy": AccuracyLearner, "practice": PracticeLearner}
+    for stage_class in STAGES:
+        for name, learner_class in learners.items():
+            simulation = BatchSimulation(stage_class, sessions, learner_class(), seed=1)
+            started = time.perf_counter()
+            simulation.run(ticks)
+            elapsed = time.perf_counter() - started
+            summary = simulation.summary()
+            print(f"{stage_class.__name__} ({name}): {simulation.answered / elapsed:,.0f} answers/s, "
+                  f"accuracy {summary['accuracy']:.2f}, finished {summary['finished']:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import gc
+import os
+import resource
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+from color_mixing_game import ColorMixingGame
+from color_theory_game import ColorTheoryGame
+from warm_cool_game import QuizGame, WarmCoolColorTheoryGame
+
+# Memory held by many concurrent sessions, e.g. a classroom server keeping one stage per learner.
+# For each stage it builds SESSIONS sessions against one headless backend, walks each to its first
+# question (inside the nested quiz for WarmCoolColorTheoryGame) and answers it, then reports:
+#   B/session    bytes each session keeps allocated (tracemalloc), shared data excluded
+#   RSS MB       growth of the process's resident set over the whole batch
+#   us/session   time to build a session and walk it to the question
+# Run it before and after adding state to a stage; data every session reads but never changes
+# belongs on the class (ScreenMachine.load_shared), not on the session.
+
+SESSIONS = 10_000
+
+# Stage -> keys pressed one per frame to reach and answer its first question
+KEYS = {
+    ColorTheoryGame: ["C", "C", "C", "P"],
+    ColorMixingGame: ["C", "T"],
+    WarmCoolColorTheoryGame: ["C", "C", "C", "C", "C", "L"],
+    QuizGame: ["C", "C", "C", "L"],
+}
+
+
+def rss():
+    # Resident set size in bytes; Linux exposes the current value, elsewhere fall back to the peak
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def build(game_class, keys, count):
+    exit_callback = lambda: None  # Shared, so the sessions are not charged a closure each
+    sessions = []
+    for seed in range(count):
+        game = game_class(exit_callback, seed=seed)
+        for key in keys:
+            game.step([key])
+        sessions.append(game)
+    return sessions
+
+
+def measure(game_class, keys, count=SESSIONS):
+    build(game_class, keys, 1)  # Load the pack and the class's shared data outside the measurement
+    gc.collect()
+    rss_before = rss()
+    tracemalloc.start()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    sessions = build(game_class, keys, count)
+    elapsed = time.perf_counter() - started
+    traced = tracemalloc.get_traced_memory()[0] - traced_before
+    tracemalloc.stop()
+    gc.collect()
+    grown = rss() - rss_before
+    del sessions
+    return traced / count, grown / 2**20, elapsed / count * 1e6
+
+
+def main(count=SESSIONS):
+    print(f"{count:,} sessions per stage")
+    print(f"{'stage':<26}{'B/session':>10}{'RSS MB':>9}{'us/session':>12}")
+    with headless.use_backend(headless.HeadlessPyxel()):
+        for game_class, keys in KEYS.items():
+            per_session, grown, microseconds = measure(game_class, keys, count)
+            print(f"{game_class.__name__:<26}{per_session:10.0f}{grown:9.1f}{microseconds:12.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else SESSIONS)
@@ -0,0 +1,95 @@
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from palette import PRIMARY_SECONDARY_PALETTE, TEXT_SLOT, WARM_COOL_PALETTE
+
+# Per-draw palette lookups: the old per-class list scans against the shared registry
+
+primary_colors_rgb = [0xffff00, 0xff0000, 0x0000ff]
+secondary_colors_rgb = [0x00ff00, 0xffa500, 0x8a2be2]
+colors_rgb = {"Yellow": 0xffff00, "Red": 0xff0000, "Blue": 0x0000ff, "Green": 0x00ff00, "Orange": 0xffa500, "Violet": 0x8a2be2}
+warm_colors_rgb = [0xc71585, 0xff0000, 0xff4500, 0xffa500, 0xffd700, 0xffff00]
+cool_colors_rgb = [0x8a2be2, 0x4b0082, 0x0000ff, 0x00ced1, 0x008000, 0x9acd32]
+
+
+# Copies of the lookups the stages used before the registry
+def legacy_theory_index(color):
+    if color in primary_colors_rgb:
+        return primary_colors_rgb.index(color) + 1
+    elif color in secondary_colors_rgb:
+        return len(primary_colors_rgb) + secondary_colors_rgb.index(color) + 1
+    else:
+        return 0
+
+def legacy_mixing_index(color):
+    color_list = list(colors_rgb.values())
+    if color in color_list:
+        return color_list.index(color) + 1
+    else:
+        return 0
+
+def legacy_warm_cool_index(color):
+    if color in warm_colors_rgb:
+        return warm_colors_rgb.index(color) + 1
+    elif color in cool_colors_rgb:
+        return len(warm_colors_rgb) + cool_colors_rgb.index(color) + 1
+    else:
+        return 0
+
+def legacy_color_name(color):
+    color_names = {
+        0xff0000: "Red",
+        0xff4500: "Red-Orange",
+        0xffa500: "Orange",
+        0xffd700: "Yellow-Orange",
+        0xffff00: "Yellow",
+        0xc71585: "Red-Violet",
+        0x8a2be2: "Violet",
+        0x4b0082: "Blue-Violet",
+        0x0000ff: "Blue",
+        0x00ced1: "Blue-Green",
+        0x008000: "Green",
+        0x9acd32: "Yellow-Green"
+    }
+    return color_names.get(color, "Unknown")
+
+
+def past_text_slot(index):
+    # The registry keeps white at TEXT_SLOT for text, so the warm/cool colors from there on sit one slot later
+    return index + (index >= TEXT_SLOT)
+
+
+def bench(label, function, colors, number=20000):
+    def run():
+        for color in colors:
+            function(color)
+    seconds = min(timeit.repeat(run, number=number, repeat=5))
+    per_call = seconds / (number * len(colors)) * 1e9
+    print(f"{label:<34} {per_call:8.1f} ns/lookup")
+    return per_call
+
+
+def main():
+    theory_colors = primary_colors_rgb + secondary_colors_rgb
+    warm_cool_colors = warm_colors_rgb + cool_colors_rgb
+    cases = [
+        ("ColorTheoryGame index", legacy_theory_index, PRIMARY_SECONDARY_PALETTE.index, theory_colors, None),
+        ("ColorMixingGame index", legacy_mixing_index, PRIMARY_SECONDARY_PALETTE.index, theory_colors, None),
+        ("Warm/cool index", legacy_warm_cool_index, WARM_COOL_PALETTE.index, warm_cool_colors, past_text_slot),
+        ("Warm/cool color_name", legacy_color_name, WARM_COOL_PALETTE.name, warm_cool_colors, None),
+    ]
+    for label, legacy, registry, colors, moved in cases:
+        expected = [legacy(color) for color in colors]
+        if moved:
+            expected = [moved(result) for result in expected]
+        assert expected == [registry(color) for color in colors]
+        before = bench(label + " (legacy)", legacy, colors)
+        after = bench(label + " (registry)", registry, colors)
+        print(f"{'':<34} {before / after:8.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
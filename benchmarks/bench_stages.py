@@ -0,0 +1,137 @@
+import os
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import headless
+from color_mixing_game import ColorMixingGame
+from color_theory_game import ColorTheoryGame
+from warm_cool_game import QuizGame, WarmCoolColorTheoryGame
+
+# Steady-state cost of one idle frame (update() + draw(), no keys pressed) on every screen of every
+# stage, run against the headless backend. For each screen it reports:
+#   us/frame   best-of-repeats time per frame
+#   calls      draw calls made in one frame, by kind
+#   peak B     largest amount of temporary memory alive at once during a frame (tracemalloc)
+#   net blk    memory blocks still allocated per frame afterwards; anything above 0 is growth
+# Run it before and after touching the frame loop to catch regressions.
+
+
+def answer(true_key, false_key):
+    # Navigation step that answers the current question correctly
+    return lambda game: true_key if game.correct_answer else false_key
+
+
+def quiz(game):
+    # WarmCoolColorTheoryGame keeps its quiz in a nested stage
+    return game.quiz_game or game
+
+
+THEORY_ANSWER = answer("P", "S")
+MIXING_ANSWER = answer("T", "F")
+WARM_COOL_ANSWER = answer("L", "W")
+
+# Stage -> (screen label, keys pressed one per frame to reach it)
+SCREENS = {
+    ColorTheoryGame: [
+        ("primary colors", []),
+        ("secondary colors", ["C"]),
+        ("end of practice", ["C", "C"]),
+        ("question", ["C", "C", "C"]),
+        ("feedback", ["C", "C", "C", THEORY_ANSWER]),
+        ("finished", ["C", "C", "C"] + [THEORY_ANSWER, "C"] * ColorTheoryGame.QUIZ_TARGET),
+    ],
+    ColorMixingGame: [
+        ("mixing examples", []),
+        ("question", ["C"]),
+        ("feedback", ["C", MIXING_ANSWER]),
+    ],
+    WarmCoolColorTheoryGame: [
+        ("warm colors", []),
+        ("instructions", ["C"]),
+        ("nested quiz", ["C", "C"]),
+        ("nested question", ["C", "C", "C", "C"]),
+        ("nested feedback", ["C", "C", "C", "C", lambda game: WARM_COOL_ANSWER(quiz(game))]),
+    ],
+    QuizGame: [
+        ("warm colors", []),
+        ("cool colors", ["C"]),
+        ("instructions", ["C", "C"]),
+        ("question", ["C", "C", "C"]),
+        ("feedback", ["C", "C", "C", WARM_COOL_ANSWER]),
+    ],
+}
+
+
+def reach(game_class, backend, keys):
+    # Build the stage against backend and press keys, one per frame, to get to a screen
+    game = game_class(lambda: None, seed=1)
+    for key in keys:
+        backend.press(key(game) if callable(key) else key)
+        game.update()
+        game.draw()
+        backend.frame_count += 1
+    backend.press(None)
+    game.update()
+    game.draw()  # First idle frame fills any static screen cache
+    return game
+
+
+def frame_time(game, frames=2000, repeat=5):
+    update, draw = game.update, game.draw
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(frames):
+            update()
+            draw()
+        best = min(best, time.perf_counter() - started)
+    return best / frames * 1e6
+
+
+def draw_calls(game, backend):
+    backend.take_calls()
+    game.update()
+    game.draw()
+    return Counter(name for name, _ in backend.take_calls())
+
+
+def allocations(game, frames=200):
+    update, draw = game.update, game.draw
+    tracemalloc.start()
+    peaks = 0
+    before = sys.getallocatedblocks()
+    for _ in range(frames):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        update()
+        draw()
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    growth = sys.getallocatedblocks() - before
+    tracemalloc.stop()
+    return peaks / frames, growth / frames
+
+
+def main():
+    print(f"{'stage':<26}{'screen':<18}{'us/frame':>9}  {'calls':<30}{'peak B':>8}{'net blk':>9}")
+    for game_class, screens in SCREENS.items():
+        for label, keys in screens:
+            backend = headless.RecordingPyxel()
+            with headless.use_backend(backend):
+                game = reach(game_class, backend, keys)
+                calls = draw_calls(game, backend)
+            # Time and trace a fresh game without recording, so the recorded calls are not counted
+            timing_backend = headless.HeadlessPyxel()
+            with headless.use_backend(timing_backend):
+                game = reach(game_class, timing_backend, keys)
+                microseconds = frame_time(game)
+                peak, growth = allocations(game)
+            summary = " ".join(f"{name}={count}" for name, count in sorted(calls.items()))
+            print(f"{game_class.__name__:<26}{label:<18}{microseconds:9.2f}  {summary:<30}{peak:8.0f}{growth:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time to first dashboard window, measured from process launch through GameUI.main(), so
+# interpreter start-up and every import on the way to the first paint are included. Run it
+# repeatedly to track regressions.
+
+DASHBOARD = """
+import json, sys, time
+import GameUI
+result = {"imported": time.time()}
+create_dashboard = GameUI.create_dashboard
+
+def first_window(launch_mode, **options):
+    # Runs inside GameUI.main, so whatever main() imports before the dashboard is timed too
+    result["main"] = time.time()
+    result["pyxel_loaded"] = "pyxel" in sys.modules
+    root, close = create_dashboard(launch_mode, preload=False, **options)
+    root.update()  # Map and paint the first window
+    result["window"] = time.time()
+    root.mainloop = lambda: None  # main() then shuts down as if the window had been closed
+    return root, close
+
+GameUI.create_dashboard = first_window
+try:
+    GameUI.main(sys.argv[1])
+except Exception as error:  # No display available; only the import timings are meaningful
+    result["error"] = str(error)
+print(json.dumps(result))
+"""
+
+# What the old single-module layout paid before any window could appear
+EAGER_IMPORTS = """
+import json, time
+import tkinter, pyxel, color_theory_game, color_mixing_game, warm_cool_game
+print(json.dumps({"imported": time.time()}))
+"""
+
+
+def run(code, *args):
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, COLOR_GAMES_ANSWERS=os.path.join(directory, "answers.log"))  # Keep the real log untouched
+        started = time.time()
+        output = subprocess.run([sys.executable, "-c", code, *args], cwd=ROOT, env=env, capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    for key in ("imported", "main", "window"):
+        if key in result:
+            result[key] = (result[key] - started) * 1000
+    return result
+
+
+def main(repeat=5, launch_mode="host"):
+    dashboard = [run(DASHBOARD, launch_mode) for _ in range(repeat)]
+    eager = [run(EAGER_IMPORTS) for _ in range(repeat)]
+
+    print(f"dashboard imports ready:   {min(r['imported'] for r in dashboard):7.1f} ms")
+    print(f"main() building dashboard: {min(r['main'] for r in dashboard):7.1f} ms (pyxel loaded: {dashboard[0]['pyxel_loaded']})")
+    if "window" in dashboard[0]:
+        print(f"first dashboard window:    {min(r['window'] for r in dashboard):7.1f} ms")
+    else:
+        print(f"first dashboard window:    not measured ({dashboard[0]['error']})")
+    print(f"eager stage imports ready: {min(r['imported'] for r in eager):7.1f} ms")
+
+
+if __name__ == "__main__":
+    main(launch_mode=sys.argv[1] if len(sys.argv) > 1 else "host")
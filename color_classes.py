@@ -0,0 +1,202 @@
+import mmap
+import os
+import sys
+import threading
+
+import numpy as np
+
+from palette import COLOR_NAMES
+from ryb_mixing import WHEEL_NAMES
+
+# Warm/cool, primary/secondary/tertiary and hue family for every 24-bit RGB color, precomputed into
+# a 16.7M-entry table of one byte per color. The table is built once from the hue rules below,
+# saved next to this module and memory-mapped, so opening it is instant and a lookup is one index.
+# Building it takes seconds, so that only ever happens on a background thread (or ahead of time, see
+# the end of this file); until the table is ready, lookups apply the hue rules directly.
+#
+# Byte layout:
+#   bits 0-3  hue family: index into FAMILIES
+#   bit 4     warm
+#   bits 5-6  order: index into ORDERS
+
+FAMILIES = WHEEL_NAMES[:12] + ("Neutral",)  # The twelve RYB color wheel hues from red, then grays
+NEUTRAL = len(FAMILIES) - 1
+ORDERS = ("neutral", "primary", "secondary", "tertiary")
+WARM_FAMILIES = ("Red-Violet", "Red", "Red-Orange", "Orange", "Yellow-Orange", "Yellow")
+
+FAMILY_MASK = 0x0f
+WARM_BIT = 0x10
+ORDER_SHIFT = 5
+
+# RGB hue (degrees) -> RYB wheel hue (degrees), linear between the points. RGB squeezes red to
+# yellow into 60 degrees and spreads green to blue over 120; the wheel gives them equal room.
+HUE_POINTS = ((0, 0), (40, 60), (60, 120), (120, 180), (180, 210), (240, 240), (300, 300), (360, 360))
+NEUTRAL_SATURATION = 0.15  # Below this saturation, or this value, a color counts as a gray
+NEUTRAL_VALUE = 0.15
+
+TABLE_MAGIC = b"CLUT"
+TABLE_VERSION = 1  # Bump when the rules change so old tables are rebuilt
+TABLE_HEADER = 16
+TABLE_SIZE = 1 << 24
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "color_classes.bin")
+tables = {}  # Path -> open ColorTable
+table_loaders = {}  # Path -> background thread building and opening that table
+
+
+def family_code(family):
+    # Byte for a hue family, given its index into FAMILIES; works on arrays too
+    family = np.asarray(family, dtype=np.uint8)
+    order = np.where(family == NEUTRAL, 0, np.where(family % 2 == 1, 3, np.where(family % 4 == 0, 1, 2)))
+    warm = np.isin(family, [FAMILIES.index(name) for name in WARM_FAMILIES])
+    return (family | np.where(warm, WARM_BIT, 0) | (order << ORDER_SHIFT)).astype(np.uint8)
+
+
+def classify_rgb(colors):
+    # Apply the hue rules directly, without the table; the builder runs this over every color
+    colors = np.asarray(colors, dtype=np.int64)
+    rgb = np.stack([(colors >> 16) & 0xff, (colors >> 8) & 0xff, colors & 0xff], axis=-1).astype(np.float32) / 255
+    value = rgb.max(axis=-1)
+    spread = value - rgb.min(axis=-1)
+    saturation = np.divide(spread, value, out=np.zeros_like(value), where=value > 0)
+    safe_spread = np.where(spread > 0, spread, 1)
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    hue = np.where(value == r, ((g - b) / safe_spread) % 6, np.where(value == g, (b - r) / safe_spread + 2, (r - g) / safe_spread + 4)) * 60
+    wheel_hue = np.interp(hue, *zip(*HUE_POINTS))
+    family = np.rint(wheel_hue / 30).astype(np.int64) % 12
+    family[(saturation < NEUTRAL_SATURATION) | (value < NEUTRAL_VALUE)] = NEUTRAL
+    return family_code(family)
+
+
+def named_codes():
+    # The stage colors take the family they are taught as, which the hue rules alone do not always
+    # give (blue-violet and indigo are only 4 degrees apart): color -> byte for each of them
+    named = [color for color, name in COLOR_NAMES.items() if name in FAMILIES]
+    return dict(zip(named, family_code([FAMILIES.index(COLOR_NAMES[color]) for color in named]).tolist()))
+
+
+def build_table(path=TABLE_PATH, chunk=1 << 20):
+    # Write the full table to path
+    table = np.empty(TABLE_SIZE, dtype=np.uint8)
+    for start in range(0, TABLE_SIZE, chunk):
+        table[start:start + chunk] = classify_rgb(np.arange(start, start + chunk))
+    named = named_codes()
+    table[list(named)] = list(named.values())
+    header = TABLE_MAGIC + TABLE_VERSION.to_bytes(4, "little")
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, "wb") as table_file:
+        table_file.write(header.ljust(TABLE_HEADER, b"\0"))
+        table_file.write(table.tobytes())
+    os.replace(partial, path)  # Other processes see either no table or a complete one
+
+
+class ColorTable:
+    def __init__(self, path):
+        with open(path, "rb") as table_file:
+            self.map = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.codes = np.frombuffer(self.map, dtype=np.uint8, count=TABLE_SIZE, offset=TABLE_HEADER)
+
+    def code(self, color):
+        return self.map[TABLE_HEADER + color]
+
+    def classify(self, colors):
+        # Bytes for an array of colors
+        return self.codes[np.asarray(colors, dtype=np.int64)]
+
+    def is_warm(self, color):
+        return bool(self.map[TABLE_HEADER + color] & WARM_BIT)
+
+    def order(self, color):
+        return ORDERS[self.map[TABLE_HEADER + color] >> ORDER_SHIFT]
+
+    def family(self, color):
+        return FAMILIES[self.map[TABLE_HEADER + color] & FAMILY_MASK]
+
+
+class DirectClassifier:
+    # Same lookups as ColorTable, worked out from the hue rules on every call; stands in for the
+    # table while it is being built
+    def __init__(self):
+        self.named = named_codes()
+
+    def code(self, color):
+        code = self.named.get(color)
+        return code if code is not None else int(classify_rgb([color])[0])
+
+    def classify(self, colors):
+        colors = np.asarray(colors, dtype=np.int64)
+        codes = classify_rgb(colors)
+        for color, code in self.named.items():
+            codes[colors == color] = code
+        return codes
+
+    def is_warm(self, color):
+        return bool(self.code(color) & WARM_BIT)
+
+    def order(self, color):
+        return ORDERS[self.code(color) >> ORDER_SHIFT]
+
+    def family(self, color):
+        return FAMILIES[self.code(color) & FAMILY_MASK]
+
+
+direct_classifier = DirectClassifier()
+
+
+def table_valid(path):
+    try:
+        with open(path, "rb") as table_file:
+            header = table_file.read(TABLE_HEADER)
+        return (header[:4] == TABLE_MAGIC and int.from_bytes(header[4:8], "little") == TABLE_VERSION
+                and os.path.getsize(path) == TABLE_HEADER + TABLE_SIZE)
+    except OSError:
+        return False
+
+
+def preload_table(path=TABLE_PATH):
+    # Open the table on a background thread, building it first if the file is missing or from an
+    # older version of the rules; called at startup so it is ready before the first stage needs it
+    loader = table_loaders.get(path)
+    if loader is None:
+        def load():
+            if not table_valid(path):
+                build_table(path)
+            tables[path] = ColorTable(path)
+
+        loader = table_loaders[path] = threading.Thread(target=load, daemon=True)
+        loader.start()
+    return loader
+
+
+def color_table(path=TABLE_PATH):
+    # The shared table, or the direct classifier while the table is still being built; never blocks,
+    # since stages call this from their frame update
+    table = tables.get(path)
+    if table is None:
+        if path in table_loaders or not table_valid(path):
+            preload_table(path)
+            return direct_classifier
+        table = tables[path] = ColorTable(path)
+    return table
+
+
+def is_warm(color):
+    return color_table().is_warm(color)
+
+
+def is_primary(color):
+    return color_table().order(color) == "primary"
+
+
+def hue_family(color):
+    return color_table().family(color)
+
+
+def classify(colors):
+    # Bulk lookup: (warm, order index, family index) arrays for an array of colors
+    codes = color_table().classify(colors)
+    return (codes & WARM_BIT).astype(bool), codes >> ORDER_SHIFT, codes & FAMILY_MASK
+
+
+# Build the table ahead of time, e.g. when installing: python color_classes.py [path]
+if __name__ == "__main__":
+    build_table(*sys.argv[1:2])
@@ -0,0 +1,152 @@
+import random
+from types import MappingProxyType
+
+import pyxel
+
+from game_host import init_window, report_answer
+from palette import PRIMARY_SECONDARY_PALETTE
+from question_pool import question_pool
+from ryb_mixing import mix, primary_mixes
+from screen_machine import ScreenMachine
+from spaced_repetition import LeitnerScheduler
+from sprite_atlas import atlas, draw_text
+
+# Define the mixing colors game
+class ColorMixingGame(ScreenMachine):
+    # Screens: 0 mixing examples, 1 question, 2 feedback
+    CONTENT_PACK = "color_mixing"
+    ANSWER_KEYS = ("T", "F")
+    TRANSITIONS = {
+        0: {"C": (None, 1), "SPACE": (None, 1)},
+        1: {"T": (("select_answer", True), 2), "F": (("select_answer", False), 2)},
+        2: {"C": ("new_question", 1), "SPACE": ("new_question", 1)},
+    }
+    DRAW_HANDLERS = {
+        0: ("draw_primary_color_mixing", True),
+        1: ("draw_quiz", False),
+        2: ("draw_feedback", False),
+    }
+    SHOW_SCORE = True
+    PALETTE = PRIMARY_SECONDARY_PALETTE  # Black, then all defined colors; mixes outside it on demand
+    ATLAS_TEXT = (("Correct!", pyxel.COLOR_GREEN), ("Incorrect!", pyxel.COLOR_RED), ("Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE))
+    __slots__ = ("questions", "current_question", "correct_answer", "answer_selected", "success", "failed", "start_time")
+
+    @classmethod
+    def shared_data(cls, content):
+        # Color names and their 24-bit RGB values, the name of each RGB value, and the mix examples
+        # for each pair of primary colors, worked out by the pigment mixing engine
+        colors_rgb = MappingProxyType(dict(content["colors"]))
+        return {
+            "colors_rgb": colors_rgb,
+            "color_names": MappingProxyType({rgb: name for name, rgb in colors_rgb.items()}),
+            "mix_examples": tuple(primary_mixes({name: colors_rgb[name] for name in content["examples"]})),
+        }
+
+    def __init__(self, exit_callback, seed=None):
+        self.exit_callback = exit_callback
+        rng = random.Random(seed)
+        self.load_shared()  # Colors, names and prompts
+        init_window(self.content["window_title"])
+        pyxel.cls(0)  # Clear screen with black
+
+        self.load_palette()
+
+        # Every ordered pair of two different colors, scheduled so missed pairs come back sooner
+        self.questions = LeitnerScheduler(question_pool(self.CONTENT_PACK, lambda: [(color1, color2) for color1 in self.colors_rgb for color2 in self.colors_rgb if color1 != color2]), rng)
+
+        self.current_question = self.get_random_mixing_question()
+        self.correct_answer = self.check_mixing(self.current_question)
+        self.answer_selected = None
+        self.success = 0
+        self.failed = 0
+        self.start_time = pyxel.frame_count
+
+        self.screen = 0  # Track which screen to display
+
+    def new_question(self):
+        self.current_question = self.get_random_mixing_question()
+        self.correct_answer = self.check_mixing(self.current_question)
+        self.answer_selected = None
+        self.start_time = pyxel.frame_count
+
+    def select_answer(self, answer):
+        self.answer_selected = answer
+        self.check_answer()
+
+    def draw_primary_color_mixing(self):
+        pyxel.text(10, 5, "Primary Colors Mixing", pyxel.COLOR_WHITE)
+        y_offset = 20
+        for color1, color2, result_color in self.mix_examples:
+            self.draw_example(10, y_offset, color1, color2, result_color)
+            y_offset += 20
+
+        pyxel.text(10, 100, "Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE)
+
+    def draw_example(self, x, y, color1, color2, result_color):
+        rgb1, rgb2 = self.colors_rgb[color1], self.colors_rgb[color2]
+        self.draw_mix_row(x, y, rgb1, rgb2, mix(rgb1, rgb2)[0])
+        draw_text(x + 95, y + 2, result_color, pyxel.COLOR_WHITE)
+
+    def draw_mix_row(self, x, y, color1, color2, result=None):
+        # Two color boxes, "+", "=" and the result's box, or "?" while it is being asked, as one atlas sprite
+        key = ("mix_row", self.color_index(color1), self.color_index(color2), None if result is None else self.color_index(result))
+        if atlas.blit(x, y, key):
+            return
+
+        def render(canvas, x, y):
+            self.draw_color_box(x, y, color1, canvas)
+            canvas.text(x + 25, y + 2, "+", pyxel.COLOR_WHITE)
+            self.draw_color_box(x + 35, y, color2, canvas)
+            canvas.text(x + 60, y + 2, "=", pyxel.COLOR_WHITE)
+            if result is None:
+                canvas.text(x + 70, y + 2, "?", pyxel.COLOR_WHITE)
+            else:
+                self.draw_color_box(x + 70, y, result, canvas)
+
+        atlas.draw(x, y, key, 90, 10, render)
+
+    def draw_color_box(self, x, y, color, canvas=None):
+        box_width = 20
+        box_height = 10
+        if canvas is None:
+            canvas = pyxel  # The screen; draw_mix_row passes an image bank while rendering a sprite
+        canvas.rect(x, y, box_width, box_height, self.color_index(color))  # Use the color for the box
+
+    def draw_quiz(self):
+        # Centering the quiz text and color boxes
+        first, second = self.current_question
+        prompt_lines = [line.format(first=first.lower(), second=second.lower(), target=self.content["target"].lower()) for line in self.content["prompt"]]
+        y_start = (pyxel.height - len(prompt_lines) * pyxel.FONT_HEIGHT) // 2 - 10
+        for index, line in enumerate(prompt_lines):
+            text_width = len(line) * pyxel.FONT_WIDTH
+            x = (pyxel.width - text_width) // 2
+            draw_text(x, y_start + index * pyxel.FONT_HEIGHT, line, pyxel.COLOR_WHITE)
+
+        # Draw the color boxes for the current question
+        y_boxes = y_start + len(prompt_lines) * pyxel.FONT_HEIGHT + 10
+        self.draw_mix_row(40, y_boxes, self.colors_rgb[first], self.colors_rgb[second])
+
+    def draw_feedback(self):
+        # Centering the feedback text
+        if self.answer_selected is not None:
+            feedback_text = "Correct!" if self.answer_selected == self.correct_answer else "Incorrect!"
+            draw_text(20, 40, feedback_text, pyxel.COLOR_GREEN if self.answer_selected == self.correct_answer else pyxel.COLOR_RED)
+            draw_text(20, 60, "Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE)
+
+    def check_answer(self):
+        correct = self.answer_selected == self.correct_answer
+        if correct:
+            self.success += 1
+        else:
+            self.failed += 1
+        self.questions.record(self.current_question, correct)
+        report_answer(self.content["results_name"], (self.colors_rgb[self.current_question[0]], self.colors_rgb[self.current_question[1]]), self.answer_selected, correct, pyxel.frame_count - self.start_time)
+
+    def get_random_mixing_question(self):
+        # Get random primary colors for mixing question
+        return self.questions.deal()
+
+    def check_mixing(self, question):
+        # The quiz asks whether the two colors mix to the pack's target color, violet by default
+        color1, color2 = question
+        return mix(self.colors_rgb[color1], self.colors_rgb[color2])[1] == self.content["target"]
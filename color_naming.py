@@ -0,0 +1,141 @@
+import os
+
+import numpy as np
+
+from palette import COLOR_NAMES
+
+# Nearest-name lookup for any 24-bit color. Colors are compared in CIELAB, where distance follows
+# perceived difference, and found through a uniform grid over the Lab range of sRGB. Each cell keeps
+# only the names that can be nearest to some point inside it (those no further from the cell than
+# the farthest point of the cell is from the best name), so a query measures a handful of names and
+# the answer is still exact.
+
+DATASET = os.path.join(os.path.dirname(os.path.abspath(__file__)), "color_names.txt")
+CELL_SIZE = 6.0  # CIELAB units per grid cell
+LAB_RANGE = ((0.0, 100.0), (-128.0, 128.0), (-128.0, 128.0))  # Bounds of L, a and b; sRGB fits inside
+NARROW_WIDTH = 8  # Candidates measured for every query; cells with more take a second pass
+CACHE_SIZE = 4096  # Single-color results kept by NamingIndex.name
+naming_indexes = {}  # Dataset path -> NamingIndex, built on first use
+
+
+def rgb_to_lab(colors):
+    # 24-bit sRGB integers to an (..., 3) CIELAB array, D65 white
+    colors = np.asarray(colors, dtype=np.int64)
+    rgb = np.stack([(colors >> 16) & 0xff, (colors >> 8) & 0xff, colors & 0xff], axis=-1) / 255.0
+    linear = np.where(rgb > 0.04045, ((rgb + 0.055) / 1.055) ** 2.4, rgb / 12.92)
+    xyz = linear @ np.array([
+        [0.4124564, 0.2126729, 0.0193339],
+        [0.3575761, 0.7151522, 0.1191920],
+        [0.1804375, 0.0721750, 0.9503041],
+    ]) / np.array([0.95047, 1.0, 1.08883])
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def load_names(path):
+    # (colors, names) from a dataset file of "rrggbb name" lines; # starts a comment
+    colors = []
+    names = []
+    with open(path, encoding="utf-8") as dataset:
+        for line in dataset:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            color, name = line.split(None, 1)
+            colors.append(int(color, 16))
+            names.append(name)
+    return colors, names
+
+
+class NamingIndex:
+    def __init__(self, colors, names, cell_size=CELL_SIZE):
+        # A color that appears more than once keeps its first name
+        unique = {}
+        for color, name in zip(colors, names):
+            unique.setdefault(color, name)
+        self.names = tuple(unique.values())
+        self.lab = rgb_to_lab(list(unique))
+        self.cell_size = cell_size
+        self.cache = {}
+
+        self.origin = np.array([low for low, _ in LAB_RANGE])
+        self.shape = np.ceil((np.array([high for _, high in LAB_RANGE]) - self.origin) / cell_size).astype(np.int64)
+
+        # Squared distance from each name to the nearest and farthest point of each cell. The grid is
+        # separable, so these are sums of per-axis terms, worked out one row of cells at a time.
+        near_terms = []
+        far_terms = []
+        for axis, size in enumerate(self.shape):
+            low = self.origin[axis] + np.arange(size)[:, None] * cell_size
+            offset = self.lab[None, :, axis]
+            near_terms.append(np.maximum(np.maximum(low - offset, offset - low - cell_size), 0) ** 2)
+            far_terms.append(np.maximum(np.abs(offset - low), np.abs(offset - low - cell_size)) ** 2)
+
+        # Candidate names for each cell, padded with a sentinel that never wins. Most cells have only
+        # a few, so queries first look at the first NARROW_WIDTH and only crowded cells at them all.
+        # Name indices fit in 16 bits for any dataset of up to 32767 names, which halves the table.
+        index_type = np.int16 if len(self.names) < np.iinfo(np.int16).max else np.int32
+        tables = []
+        for lightness, a in np.ndindex(*self.shape[:2]):
+            nearest = near_terms[2] + (near_terms[0][lightness] + near_terms[1][a])
+            farthest = far_terms[2] + (far_terms[0][lightness] + far_terms[1][a])
+            candidate = nearest <= farthest.min(axis=1, keepdims=True)
+            order = np.argsort(~candidate, axis=1, kind="stable").astype(index_type)
+            tables.append(np.where(np.take_along_axis(candidate, order, axis=1), order, len(self.names)))
+        self.counts = np.concatenate([(table < len(self.names)).sum(axis=1) for table in tables])
+        width = int(self.counts.max())
+        self.candidates = np.concatenate([table[:, :width] for table in tables])
+        self.padded_lab = np.vstack([self.lab, np.full((1, 3), np.inf)])
+
+    def cell_of(self, lab):
+        position = np.floor((lab - self.origin) / self.cell_size).astype(np.int64)
+        position = np.clip(position, 0, self.shape - 1)
+        return np.ravel_multi_index(position.T, self.shape)
+
+    def nearest(self, colors, chunk=65536):
+        # Index into names of the nearest named color for each 24-bit color, in bulk
+        colors = np.asarray(colors, dtype=np.int64)
+        lab = rgb_to_lab(colors.reshape(-1))
+        result = np.empty(len(lab), dtype=np.int32)
+        for start in range(0, len(lab), chunk):
+            part = lab[start:start + chunk]
+            cells = self.cell_of(part)
+            result[start:start + chunk] = self.closest(part, self.candidates[cells, :NARROW_WIDTH])
+            crowded = np.flatnonzero(self.counts[cells] > NARROW_WIDTH)
+            if crowded.size:
+                result[start + crowded] = self.closest(part[crowded], self.candidates[cells[crowded]])
+        return result.reshape(colors.shape)
+
+    def closest(self, lab, candidates):
+        distances = ((self.padded_lab[candidates] - lab[:, None, :]) ** 2).sum(axis=-1)
+        return candidates[np.arange(len(lab)), distances.argmin(axis=1)]
+
+    def names_of(self, colors):
+        # Nearest names for a batch of colors, as a list
+        return [self.names[index] for index in self.nearest(colors).reshape(-1).tolist()]
+
+    def name(self, color):
+        # Nearest name for one color; repeated colors, like those drawn every frame, are a dict hit
+        name = self.cache.get(color)
+        if name is None:
+            if len(self.cache) >= CACHE_SIZE:
+                self.cache.clear()
+            name = self.cache[color] = self.names[int(self.nearest([color])[0])]
+        return name
+
+
+def naming_index(path=DATASET):
+    # Shared index over the stage color names followed by the dataset, so stage names win ties
+    index = naming_indexes.get(path)
+    if index is None:
+        colors, names = load_names(path)
+        index = naming_indexes[path] = NamingIndex([*COLOR_NAMES, *colors], [*COLOR_NAMES.values(), *names])
+    return index
+
+
+def color_name(color):
+    return naming_index().name(color)
+
+
+def color_names(colors):
+    return naming_index().names_of(colors)
@@ -0,0 +1,167 @@
+import random
+from types import MappingProxyType
+
+import pyxel
+
+from color_classes import is_primary
+from game_host import init_window, report_answer
+from palette import PRIMARY_SECONDARY_PALETTE
+from question_pool import question_pool
+from screen_machine import ScreenMachine
+from spaced_repetition import LeitnerScheduler
+from sprite_atlas import draw_text
+
+# Define the primary and secondary colors game
+class ColorTheoryGame(ScreenMachine):
+    # Screens: 0-2 theory, 3 deal a question, 4 question, 5 feedback, 6 finished after QUIZ_TARGET correct answers
+    QUIZ_TARGET = 5
+    CONTENT_PACK = "color_theory"
+    ANSWER_KEYS = ("P", "S")
+    TRANSITIONS = {
+        0: {"C": (None, 1), "SPACE": (None, 1)},
+        1: {"C": (None, 2), "SPACE": (None, 2)},
+        2: {"C": (None, 3), "SPACE": (None, 3)},
+        4: {"P": (("select_answer", True), 5), "S": (("select_answer", False), 5)},
+        5: {"C": (None, 3), "SPACE": (None, 3)},
+    }
+    AUTO_TRANSITIONS = {
+        3: ("new_question", 4),
+        4: ("quiz_complete", 6),
+    }
+    DRAW_HANDLERS = {
+        0: ("draw_primary_colors", True),
+        1: ("draw_secondary_colors", True),
+        2: ("draw_complete_message", True),
+        4: ("draw_question", False),
+        5: ("draw_feedback", False),
+    }
+    SHOW_SCORE = True
+    PALETTE = PRIMARY_SECONDARY_PALETTE  # Black, then primary and secondary colors; others on demand
+    ATLAS_TEXT = (("Correct!", pyxel.COLOR_GREEN), ("Incorrect!", pyxel.COLOR_RED), ("Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE))
+    __slots__ = ("questions", "current_color", "correct_answer", "answer_selected", "success", "failed", "start_time")
+
+    @classmethod
+    def shared_data(cls, content):
+        # Primary and secondary colors as 24-bit RGB values, and the pack's name for each color
+        colors = content["colors"]
+        return {
+            "primary_colors_rgb": tuple(colors[name] for name in content["primary"]),
+            "secondary_colors_rgb": tuple(colors[name] for name in content["secondary"]),
+            "color_names": MappingProxyType({rgb: name for name, rgb in colors.items()}),
+        }
+
+    def __init__(self, exit_callback, seed=None):
+        self.exit_callback = exit_callback
+        rng = random.Random(seed)
+        self.load_shared()  # Colors, names and prompts
+        init_window(self.content["window_title"])
+        pyxel.cls(0)  # Clear screen with black
+
+        self.load_palette()
+
+        # Spaced repetition over the pack's shared pool: missed colors come back sooner than known ones
+        self.questions = LeitnerScheduler(question_pool(self.CONTENT_PACK, lambda: self.primary_colors_rgb + self.secondary_colors_rgb), rng)
+
+        self.screen = 0  # Track which screen to display
+        self.current_color = None
+        self.correct_answer = None
+        self.answer_selected = None
+        self.success = 0
+        self.failed = 0
+        self.start_time = pyxel.frame_count
+
+    def new_question(self):
+        self.current_color = self.get_random_color()
+        self.correct_answer = self.is_primary_color(self.current_color)
+        self.answer_selected = None
+        self.start_time = pyxel.frame_count
+
+    def select_answer(self, answer):
+        self.answer_selected = answer
+        self.check_answer()
+
+    def quiz_complete(self):
+        # Guard for the finished screen, reached once the score threshold is met
+        return self.success >= self.QUIZ_TARGET
+
+    def draw_primary_colors(self):
+        pyxel.cls(0)  # Clear screen with black
+        
+        # Display primary colors category
+        pyxel.text(10, 5, "Primary Colors:", pyxel.COLOR_WHITE)
+        for idx, color in enumerate(self.primary_colors_rgb):
+            y = 20 + idx * 15  # Vertical position for each color box
+            self.draw_color_box_theory(10, y, color)
+            pyxel.text(35, y + 2, self.color_name(color), pyxel.COLOR_WHITE)
+
+        pyxel.text(40, 110, "Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE)
+
+    def draw_secondary_colors(self):
+        pyxel.cls(0)  # Clear screen with black
+        
+        # Display secondary colors category
+        pyxel.text(10, 5, "Secondary Colors:", pyxel.COLOR_WHITE)
+        for idx, color in enumerate(self.secondary_colors_rgb):
+            y = 20 + idx * 15  # Vertical position for each color box
+            self.draw_color_box_theory(10, y, color)
+            pyxel.text(35, y + 2, self.color_name(color), pyxel.COLOR_WHITE)
+
+        pyxel.text(40, 110, "Press 'C' or 'SPACE' to finish", pyxel.COLOR_WHITE)
+
+    def draw_complete_message(self):
+        pyxel.cls(0)  # Clear screen with black
+        
+        pyxel.text(50, 60, "End of practice!", pyxel.COLOR_WHITE)
+        pyxel.text(40, 110, "Press 'C' or 'SPACE' to continue to quiz", pyxel.COLOR_WHITE)
+
+    def draw_color_box_theory(self, x, y, color):
+        # Specify the size of the box for the theory part
+        box_width = 20  # Width of the box
+        box_height = 10  # Height of the box
+
+        # Draw a filled rectangle (box) at the specified position
+        pyxel.rect(x, y, box_width, box_height, self.color_index(color))
+
+    def draw_question(self):
+        # Display the color challenge and key prompts
+        for index, line in enumerate(self.content["prompt"]):
+            draw_text(20, 10 + index * 10, line, pyxel.COLOR_WHITE)
+
+        # Display current color box
+        self.draw_color_box_quiz()
+
+    def draw_feedback(self):
+        # Display answer feedback
+        feedback_text = "Correct!" if self.answer_selected == self.correct_answer else "Incorrect!"
+        draw_text(20, 30, feedback_text, pyxel.COLOR_GREEN if self.answer_selected == self.correct_answer else pyxel.COLOR_RED)
+
+        continue_text = "Press 'C' or 'SPACE' to continue"
+        draw_text(20, 50, continue_text, pyxel.COLOR_WHITE)
+
+    def draw_color_box_quiz(self, x=44, y=None, color=None):
+        if color is None:
+            color = self.current_color
+        if y is None:
+            y = pyxel.height // 3 + 14  # Y-coordinate of the top-left corner of the box, adjusted down
+
+        # Specify the size of the box for the quiz part
+        box_width = 60  # Width of the box, made bigger
+        box_height = 60  # Height of the box, made bigger
+
+        # Draw a filled rectangle (box) at the specified position
+        pyxel.rect(x, y, box_width, box_height, self.color_index(color))
+
+    def check_answer(self):
+        correct = self.answer_selected == self.correct_answer
+        if correct:
+            self.success += 1
+        else:
+            self.failed += 1
+        self.questions.record(self.current_color, correct)
+        report_answer(self.content["results_name"], (self.current_color,), self.answer_selected, correct, pyxel.frame_count - self.start_time)
+
+    def get_random_color(self):
+        return self.questions.deal()
+
+    def is_primary_color(self, color):
+        return is_primary(color)
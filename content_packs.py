@@ -0,0 +1,205 @@
+import importlib
+import json
+import marshal
+import os
+from types import MappingProxyType
+
+# Content packs: the colors, names, prompts, window title and answer keys of a stage, kept in files
+# instead of the stage class. Each pack is a directory under packs/ holding
+#   pack.json     metadata the dashboard lists packs by: title, stage engine, order, description
+#   content.json  everything the stage shows, checked against the engine's rules when first parsed
+# A pack's content is only parsed when a stage using it starts. The checked result is cached in
+# packs/.cache as marshal data, so later runs skip JSON parsing and validation unless a file changed.
+
+PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "packs")
+CACHE_FORMAT = 2  # Bump when the checked form changes so old caches are ignored
+ANSWER_KEYS = ("F", "L", "P", "S", "T", "W")  # Keys a pack may answer with: INPUT_KEYS less continue and exit
+
+# Stage engines a pack can run on: module and class, imported only when a pack is launched
+ENGINES = {
+    "color_theory": ("color_theory_game", "ColorTheoryGame"),
+    "color_mixing": ("color_mixing_game", "ColorMixingGame"),
+    "warm_cool": ("warm_cool_game", "WarmCoolColorTheoryGame"),
+}
+
+# Content each engine needs beyond the common window_title, colors, keys and prompt:
+# key -> "group" (list of color names from colors), "name" (one color name) or "lines" (list of text lines)
+ENGINE_FIELDS = {
+    "color_theory": {"primary": "group", "secondary": "group"},
+    "color_mixing": {"examples": "group", "target": "name"},
+    "warm_cool": {"warm": "group", "cool": "group", "instructions": "lines"},
+}
+
+# Order checks against color_classes for groups whose meaning is a color property
+GROUP_RULES = {
+    ("color_theory", "primary"): lambda table, color: table.order(color) == "primary",
+    ("color_theory", "secondary"): lambda table, color: table.order(color) == "secondary",
+    ("warm_cool", "warm"): lambda table, color: table.is_warm(color),
+    ("warm_cool", "cool"): lambda table, color: not table.is_warm(color),
+}
+
+loaded_packs = {}  # Pack name -> checked content, shared by every session in the process
+stage_classes = {}  # Pack name -> stage class
+pack_errors = {}  # Pack name -> why list_packs left it out, for the dashboard to report
+
+
+class PackError(ValueError):
+    pass
+
+
+def list_packs(path=PACKS_DIR):
+    # Pack name -> metadata for every usable pack, in dashboard order; reads pack.json files only.
+    # A pack whose pack.json cannot be used is left out, and why is kept in pack_errors.
+    packs = []
+    for name in sorted(os.listdir(path)):
+        meta_path = os.path.join(path, name, "pack.json")
+        if not os.path.isfile(meta_path):
+            continue
+        try:
+            meta = read_meta(name, meta_path)
+        except (OSError, PackError) as error:
+            pack_errors[name] = str(error)
+            continue
+        pack_errors.pop(name, None)
+        packs.append((meta.get("order", 0), name, meta))
+    return {name: meta for _, name, meta in sorted(packs, key=lambda pack: pack[:2])}
+
+
+def read_meta(name, meta_path):
+    with open(meta_path, encoding="utf-8") as meta_file:
+        try:
+            meta = json.load(meta_file)
+        except ValueError as error:
+            raise PackError(f"{name}: pack.json is not valid JSON ({error})") from None
+    if not isinstance(meta, dict) or not isinstance(meta.get("title"), str):
+        raise PackError(f"{name}: pack.json must give the pack a title")
+    if meta.get("stage") not in ENGINES:
+        raise PackError(f"{name}: unknown stage {meta.get('stage')!r}")
+    if not isinstance(meta.get("order", 0), (int, float)):
+        raise PackError(f"{name}: order must be a number")
+    return meta
+
+
+def pack_signature(directory):
+    # Changes whenever either pack file is edited
+    return tuple((stat.st_mtime_ns, stat.st_size) for stat in
+                 (os.stat(os.path.join(directory, file_name)) for file_name in ("pack.json", "content.json")))
+
+
+def load_pack(name, path=PACKS_DIR):
+    # Checked content of a pack: from memory, else the binary cache, else parsed and checked
+    content = loaded_packs.get(name)
+    if content is not None:
+        return content
+    directory = os.path.join(path, name)
+    signature = pack_signature(directory)
+    cache_path = os.path.join(path, ".cache", name + ".bin")
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cache_format, cached_signature, content = marshal.load(cache_file)
+        if cache_format != CACHE_FORMAT or cached_signature != signature:
+            content = None
+    except (OSError, EOFError, ValueError, TypeError):
+        content = None
+    if content is None:
+        content = parse_pack(directory)
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            partial = f"{cache_path}.{os.getpid()}.tmp"
+            with open(partial, "wb") as cache_file:
+                marshal.dump((CACHE_FORMAT, signature, content), cache_file)
+            os.replace(partial, cache_path)
+        except OSError:
+            pass  # The cache only saves parsing next time, e.g. the packs may be installed read-only
+    content["colors"] = MappingProxyType(content["colors"])
+    content = loaded_packs[name] = MappingProxyType(content)
+    return content
+
+
+def parse_pack(directory):
+    # Read and check a pack's files. The result holds only plain dicts, tuples, strings and ints.
+    name = os.path.basename(directory)
+    with open(os.path.join(directory, "pack.json"), encoding="utf-8") as meta_file:
+        meta = json.load(meta_file)
+    with open(os.path.join(directory, "content.json"), encoding="utf-8") as content_file:
+        raw = json.load(content_file)
+    stage = meta.get("stage")
+    if stage not in ENGINES:
+        raise PackError(f"{name}: unknown stage {stage!r}")
+
+    def require(key, kind):
+        if not isinstance(raw.get(key), kind):
+            raise PackError(f"{name}: {key} must be a {kind.__name__}")
+        return raw[key]
+
+    def lines(key):
+        value = require(key, list)
+        if not all(isinstance(line, str) for line in value):
+            raise PackError(f"{name}: {key} must be a list of text lines")
+        return tuple(value)
+
+    colors = {}
+    for color_name, value in require("colors", dict).items():
+        if not (isinstance(value, str) and len(value) == 7 and value.startswith("#")):
+            raise PackError(f"{name}: color {color_name} must be written #rrggbb")
+        colors[color_name] = int(value[1:], 16)
+
+    keys = tuple(require("keys", list))
+    if len(keys) != 2 or len(set(keys)) != 2 or not set(keys) <= set(ANSWER_KEYS):
+        raise PackError(f"{name}: keys must be two different keys from {', '.join(ANSWER_KEYS)}, true answer first")
+
+    content = {
+        "name": name,
+        "stage": stage,
+        "results_name": meta.get("results_name", name),  # Name the pack's sessions and answers are saved under
+        "window_title": require("window_title", str),
+        "colors": colors,
+        "keys": keys,
+        "prompt": lines("prompt"),
+    }
+    for key, kind in ENGINE_FIELDS[stage].items():
+        if kind == "lines":
+            content[key] = lines(key)
+        elif kind == "name":
+            content[key] = check_names(name, [require(key, str)], colors)[0]
+        else:
+            content[key] = check_names(name, require(key, list), colors)
+            if not content[key]:
+                raise PackError(f"{name}: {key} must list at least one color")  # The quiz deals from the groups
+
+    # Group colors must be what the group says they are, or the quiz would mark right answers wrong
+    from color_classes import color_table
+    table = color_table()
+    for (rule_stage, group), rule in GROUP_RULES.items():
+        if rule_stage == stage:
+            wrong = [color_name for color_name in content[group] if not rule(table, colors[color_name])]
+            if wrong:
+                raise PackError(f"{name}: {', '.join(wrong)} do not belong in {group}")
+
+    # Prompts are formatted with the question's color names; check the fields now, not mid-game
+    try:
+        for line in content["prompt"]:
+            line.format(first="", second="", target="")
+    except (KeyError, IndexError, ValueError) as error:
+        raise PackError(f"{name}: bad prompt field {error}") from None
+    return content
+
+
+def check_names(pack, names, colors):
+    unknown = [color_name for color_name in names if color_name not in colors]
+    if unknown:
+        raise PackError(f"{pack}: {', '.join(unknown)} not listed in colors")
+    return tuple(names)
+
+
+def stage_class(name):
+    # Stage class for a pack. A pack that answers with other keys than its engine gets a subclass
+    # with the keys swapped in its transition tables.
+    game_class = stage_classes.get(name)
+    if game_class is None:
+        meta = list_packs()[name]
+        module_name, class_name = ENGINES[meta["stage"]]
+        engine = getattr(importlib.import_module(module_name), class_name)
+        game_class = engine.for_pack(name, load_pack(name)["keys"])
+        stage_classes[name] = game_class
+    return game_class
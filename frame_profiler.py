@@ -0,0 +1,80 @@
+import csv
+import time
+from array import array
+
+import pyxel
+
+# Opt-in frame-time profiler. game_host wraps the update/draw callbacks with it only when
+# game_host.frame_profiler is set, so an unprofiled run calls the stage directly.
+HUD_KEY = "F3"
+HUD_REFRESH_FRAMES = 30  # Recompute the HUD figures this often rather than sorting every frame
+
+
+class FrameProfiler:
+    # update() and draw() durations for the most recent frames, in a fixed-size ring buffer
+    def __init__(self, capacity=1800):
+        self.capacity = capacity
+        self.update_times = array("d", bytes(8 * capacity))  # Seconds
+        self.draw_times = array("d", bytes(8 * capacity))
+        self.frames = 0  # Frames recorded so far, including any overwritten
+        self.last_update = 0.0
+        self.hud_visible = False
+        self.hud_text = ""
+
+    def wrap(self, update, draw):
+        # Return timed versions of a pair of frame callbacks
+        perf_counter = time.perf_counter
+
+        def timed_update():
+            started = perf_counter()
+            update()
+            self.last_update = perf_counter() - started
+            if pyxel.btnp(getattr(pyxel, "KEY_" + HUD_KEY)):
+                self.hud_visible = not self.hud_visible
+                self.hud_text = ""
+
+        def timed_draw():
+            started = perf_counter()
+            draw()
+            elapsed = perf_counter() - started
+            slot = self.frames % self.capacity
+            self.update_times[slot] = self.last_update
+            self.draw_times[slot] = elapsed
+            self.frames += 1
+            if self.hud_visible:
+                self.draw_hud()
+
+        return timed_update, timed_draw
+
+    def samples(self):
+        # (frame number, update seconds, draw seconds) for the frames still in the buffer, oldest first
+        count = min(self.frames, self.capacity)
+        first = self.frames - count
+        return [(frame, self.update_times[frame % self.capacity], self.draw_times[frame % self.capacity])
+                for frame in range(first, self.frames)]
+
+    def stats(self):
+        # (average, 95th percentile, worst) update + draw time in milliseconds
+        totals = sorted(update + draw for _, update, draw in self.samples())
+        if not totals:
+            return 0.0, 0.0, 0.0
+        p95 = totals[min(len(totals) - 1, int(len(totals) * 0.95))]
+        return sum(totals) / len(totals) * 1000, p95 * 1000, totals[-1] * 1000
+
+    def hud_state(self):
+        # What the HUD shows, for game_host.IdleThrottle to compare along with the stage's view_state
+        return self.hud_visible, self.hud_text
+
+    def draw_hud(self):
+        if self.frames % HUD_REFRESH_FRAMES == 1 or not self.hud_text:
+            average, p95, worst = self.stats()
+            self.hud_text = f"avg {average:.2f} p95 {p95:.2f} max {worst:.2f} ms"
+        pyxel.rect(0, pyxel.height - 8, pyxel.width, 8, 0)
+        pyxel.text(2, pyxel.height - 7, self.hud_text, pyxel.COLOR_WHITE)
+
+    def export_csv(self, path):
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(["frame", "update_ms", "draw_ms", "total_ms"])
+            for frame, update, draw in self.samples():
+                writer.writerow([frame, f"{update * 1000:.4f}", f"{draw * 1000:.4f}", f"{(update + draw) * 1000:.4f}"])
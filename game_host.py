@@ -0,0 +1,235 @@
+import queue
+import threading
+
+import pyxel
+
+from sprite_atlas import atlas, queue_text
+
+# Optional FrameProfiler (see frame_profiler.py). When set, the frame callbacks passed to pyxel.run
+# are wrapped with timing; when None they are passed through untouched.
+frame_profiler = None
+
+# Skip draw() on frames where nothing it depends on has changed (see IdleThrottle)
+idle_throttle = True
+
+# Optional directory for input recordings (see recording.py). When set, every stage started through
+# create_stage gets a fresh seed, and its input is recorded and saved there when it exits.
+recordings_dir = None
+
+class IdleThrottle:
+    # Pyxel keeps the last frame on screen, so while view_state() returns the same value as on the
+    # last drawn frame, draw() can be skipped. update() still runs every frame: btnp() only reports
+    # a key on the frame it went down, and timers count frames. A full redraw is still done every
+    # refresh_frames so the window recovers if it was covered or resized.
+    def __init__(self, view_state, refresh_frames=60):
+        self.view_state = view_state
+        self.refresh_frames = refresh_frames
+        self.last_state = None
+        self.skipped = 0
+
+    def wrap(self, draw):
+        def throttled_draw():
+            state = self.view_state()
+            if state == self.last_state and self.skipped < self.refresh_frames:
+                self.skipped += 1
+                return
+            self.last_state = state
+            self.skipped = 0
+            draw()
+        return throttled_draw
+
+def frame_callbacks(update, draw, view_state=None):
+    if idle_throttle and view_state is not None:
+        if frame_profiler is not None:
+            # The HUD is drawn over the stage, so showing, hiding or updating it needs a redraw too
+            stage_state = view_state
+            view_state = lambda: (stage_state(), frame_profiler.hud_state())
+        draw = IdleThrottle(view_state).wrap(draw)
+    if frame_profiler is None:
+        return update, draw
+    return frame_profiler.wrap(update, draw)
+
+def create_stage(game_class, exit_callback):
+    # Construct a stage; returns it and the update function to call every frame
+    if recordings_dir is None:
+        game = game_class(exit_callback)
+        return game, game.update
+    from recording import InputRecorder, new_seed
+    recorder = InputRecorder(game_class.CONTENT_PACK, new_seed(), recordings_dir, game_class.EXIT_KEY)
+
+    def recorded_exit():
+        recorder.save()  # Already saved if the stage quit on its exit key; this covers the host window closing
+        exit_callback()
+
+    game = game_class(recorded_exit, seed=recorder.recording.seed)
+    return game, recorder.wrap(game.update)
+
+# Function to safely start a Pyxel game in a separate thread
+def start_game(game_class, exit_callback):
+    def game_thread():
+        game, update = create_stage(game_class, exit_callback)
+        pyxel.run(*frame_callbacks(update, game.draw, game.view_state))
+    thread = threading.Thread(target=game_thread)
+    thread.start()
+
+# Static screens pre-rendered into Pyxel's image banks, keyed by the draw method that produced them.
+# Each bank holds two full screens stacked vertically; screens beyond that are drawn directly.
+static_screens = {}
+STATIC_SCREEN_SLOTS = 6
+
+def reset_static_screens():
+    # The image banks start blank after pyxel.init, so forget anything cached for a previous window
+    static_screens.clear()
+
+def draw_static_screen(draw_function):
+    key = draw_function.__qualname__
+    slot = static_screens.get(key)
+    if slot is not None:
+        bank, v = slot
+        pyxel.blt(0, 0, bank, 0, v, pyxel.width, pyxel.height)
+        return
+
+    # First frame: draw normally, then copy the finished screen into a free slot
+    draw_function()
+    slot_index = len(static_screens)
+    if slot_index < STATIC_SCREEN_SLOTS:
+        bank, v = slot_index // 2, (slot_index % 2) * pyxel.height
+        pyxel.images[bank].blt(0, v, pyxel.screen, 0, 0, pyxel.width, pyxel.height)
+        static_screens[key] = (bank, v)
+
+# Functions called as listener(stage, colors, answer, correct, frames) every time a stage checks an
+# answer. colors is a tuple of the 24-bit RGB values in the question and frames is the response time.
+answer_listeners = []
+
+def report_answer(stage, colors, answer, correct, frames):
+    for listener in answer_listeners:
+        listener(stage, colors, answer, correct, frames)
+
+# Window hooks used by the stages. While a GameHost owns the Pyxel window the stages reuse it
+# instead of calling pyxel.init again, and exiting a stage hands the window back to the host.
+SCREEN_WIDTH = 160
+SCREEN_HEIGHT = 120
+active_host = None
+
+def init_window(title):
+    if active_host is not None:
+        pyxel.title(title)
+    else:
+        pyxel.init(SCREEN_WIDTH, SCREEN_HEIGHT, title=title)
+        atlas.reset()
+    reset_static_screens()
+
+def quit_window():
+    if active_host is not None:
+        active_host.stage_finished()
+    else:
+        pyxel.quit()
+
+def release_host():
+    # Called by the dashboard once everything it writes is saved; a shut-down host then quits Pyxel
+    if active_host is not None:
+        active_host.released.set()
+
+# Long-lived owner of the Pyxel window. Pyxel is initialised once on the host thread and
+# stages are swapped in place through a command queue fed by the dashboard.
+# warm_up lists stage classes whose text is rendered into the sprite atlas a few lines per frame
+# from startup, while the host waits for its first stage. It may be a generator that imports them,
+# so the imports run on the host thread.
+class GameHost:
+    def __init__(self, warm_up=()):
+        self.warm_up = warm_up
+        self.commands = queue.Queue()
+        self.stage = None
+        self.stage_update = None  # The stage's update, wrapped by create_stage when recording
+        self.default_colors = None
+        self.thread = None
+        self.stopped = threading.Event()  # Set once a shutdown has ended the running stage
+        self.released = threading.Event()  # Set by release_host(); quitting Pyxel ends the process
+
+    def start(self):
+        # Start the host thread on first use; later launches reuse the running window
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self.run, daemon=True)
+            self.thread.start()
+
+    def launch(self, game_class, exit_callback):
+        self.commands.put(("launch", game_class, exit_callback))
+        self.start()
+
+    def shutdown(self, timeout=5.0):
+        # End the running stage and wait until its exit callback has run. The window stays open
+        # until release_host(), so the caller can save the stage's results before Pyxel quits.
+        if self.thread is None or not self.thread.is_alive():
+            return
+        self.commands.put(("shutdown", None, None))
+        self.stopped.wait(timeout)
+
+    def run(self):
+        global active_host
+        pyxel.init(SCREEN_WIDTH, SCREEN_HEIGHT, title="Color Games", quit_key=pyxel.KEY_NONE)
+        self.default_colors = list(pyxel.colors)
+        atlas.reset()
+        self.warm_up = list(self.warm_up)  # Kept for a window reopened by start()
+        for game_class in self.warm_up:
+            queue_text(game_class.atlas_text())
+        active_host = self
+        try:
+            pyxel.run(*frame_callbacks(self.update, self.draw, self.view_state))
+        finally:
+            active_host = None
+            # The window was closed; hand control back to the dashboard
+            stage = self.stage
+            self.stage = None
+            if stage is not None:
+                stage.exit_callback()
+
+    def process_commands(self):
+        while True:
+            try:
+                command, game_class, exit_callback = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            if command == "launch":
+                # A stage still running is replaced, which ends it as if it had exited, so its
+                # session is closed before the new one starts
+                replaced = self.stage
+                self.stage_finished()
+                if replaced is not None:
+                    replaced.exit_callback()
+                self.stage, self.stage_update = create_stage(game_class, exit_callback)
+            elif command == "shutdown":
+                # The running stage ends as if it had exited, so its session and recording are saved
+                replaced = self.stage
+                self.stage_finished()
+                if replaced is not None:
+                    replaced.exit_callback()
+                self.stopped.set()
+                self.released.wait()
+                pyxel.quit()
+                return
+
+    def stage_finished(self):
+        # Called through quit_window() when the active stage exits
+        if self.stage is None:
+            return
+        self.stage = None
+        pyxel.title("Color Games")
+        pyxel.colors.from_list(self.default_colors)
+        reset_static_screens()
+
+    def view_state(self):
+        stage = self.stage
+        return stage, stage.view_state() if stage is not None else None
+
+    def update(self):
+        self.process_commands()
+        if self.stage is not None:
+            self.stage_update()
+        atlas.warm_up()
+
+    def draw(self):
+        if self.stage is not None:
+            self.stage.draw()
+        else:
+            pyxel.cls(0)
+            pyxel.text(18, 57, "Choose a stage in the dashboard", pyxel.COLOR_WHITE)
@@ -0,0 +1,239 @@
+import time
+
+import color_mixing_game
+import color_theory_game
+import frame_profiler
+import game_host
+import recording
+import screen_machine
+import sprite_atlas
+import warm_cool_game
+
+# Modules whose global "pyxel" is swapped for the headless backend
+GAME_MODULES = [game_host, frame_profiler, recording, screen_machine, sprite_atlas, color_theory_game, color_mixing_game, warm_cool_game]
+
+# Key codes mirror pyxel's so scripted inputs and recordings mean the same thing in both backends
+KEY_CODES = {
+    "SPACE": 32,
+    "C": 99,
+    "E": 101,
+    "F": 102,
+    "L": 108,
+    "P": 112,
+    "S": 115,
+    "T": 116,
+    "W": 119,
+    "F3": 1073741884,
+}
+
+
+class HeadlessImage:
+    # Stand-in for a pyxel.Image; the stages copy whole screens into image banks and render atlas sprites there
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+    def rect(self, x, y, w, h, col):
+        pass
+
+    def text(self, x, y, s, col):
+        pass
+
+    def blt(self, x, y, img, u, v, w, h, colkey=None):
+        pass
+
+
+class HeadlessColors(list):
+    # Stand-in for pyxel.colors, which the stages replace with from_list()
+    def from_list(self, colors):
+        self[:] = colors
+
+
+# Window-free stand-in for the parts of the pyxel module the stages use
+class HeadlessPyxel:
+    FONT_WIDTH = 4
+    FONT_HEIGHT = 6
+
+    COLOR_BLACK = 0
+    COLOR_NAVY = 1
+    COLOR_PURPLE = 2
+    COLOR_GREEN = 3
+    COLOR_BROWN = 4
+    COLOR_DARK_BLUE = 5
+    COLOR_LIGHT_BLUE = 6
+    COLOR_WHITE = 7
+    COLOR_RED = 8
+    COLOR_ORANGE = 9
+    COLOR_YELLOW = 10
+    COLOR_LIME = 11
+    COLOR_CYAN = 12
+    COLOR_GRAY = 13
+    COLOR_PINK = 14
+    COLOR_PEACH = 15
+
+    KEY_NONE = 0
+    KEY_SPACE = KEY_CODES["SPACE"]
+    KEY_C = KEY_CODES["C"]
+    KEY_E = KEY_CODES["E"]
+    KEY_F = KEY_CODES["F"]
+    KEY_L = KEY_CODES["L"]
+    KEY_P = KEY_CODES["P"]
+    KEY_S = KEY_CODES["S"]
+    KEY_T = KEY_CODES["T"]
+    KEY_W = KEY_CODES["W"]
+    KEY_F3 = KEY_CODES["F3"]
+
+    def __init__(self):
+        self.width = 160
+        self.height = 120
+        self.window_title = ""
+        self.frame_count = 0
+        self.colors = HeadlessColors()
+        self.images = [HeadlessImage(256, 256) for _ in range(3)]
+        self.screen = HeadlessImage(self.width, self.height)
+        self.pressed = frozenset()  # Keys pressed in the current frame
+        self.running = False
+
+    # System
+    def init(self, width, height, title="Pyxel", fps=30, **kwargs):
+        self.width = width
+        self.height = height
+        self.window_title = title
+        self.frame_count = 0
+        self.screen = HeadlessImage(width, height)
+        self.running = True
+
+    def quit(self):
+        self.running = False
+
+    def title(self, title):
+        self.window_title = title
+
+    def run(self, update, draw):
+        self.play(update, draw, ())
+
+    # Input
+    def btnp(self, key, hold=0, repeat=0):
+        return key in self.pressed
+
+    def press(self, keys):
+        # Inject the keys btnp() reports, for stepping a stage by hand instead of through play()
+        self.pressed = keys_to_codes(keys)
+
+    # Graphics; nothing is rasterised, the stages only need the calls to succeed
+    def cls(self, col):
+        pass
+
+    def rect(self, x, y, w, h, col):
+        pass
+
+    def text(self, x, y, s, col):
+        pass
+
+    def blt(self, x, y, img, u, v, w, h, colkey=None):
+        pass
+
+    def play(self, update, draw, inputs, draw_frames=True):
+        # Step update()/draw() once per scripted frame, as fast as possible, until
+        # the inputs run out or the stage quits. Returns the number of frames stepped.
+        self.running = True
+        frames = 0
+        for keys in inputs:
+            self.pressed = keys_to_codes(keys)
+            update()
+            if not self.running:
+                break
+            if draw_frames:
+                draw()
+            self.frame_count += 1
+            frames += 1
+        self.pressed = frozenset()
+        return frames
+
+
+class RecordingPyxel(HeadlessPyxel):
+    # Headless backend that also keeps every draw call, for counting calls per frame in benchmarks
+    def __init__(self):
+        super().__init__()
+        self.calls = []  # (name, args) in call order since the last take_calls()
+
+    def take_calls(self):
+        calls = self.calls
+        self.calls = []
+        return calls
+
+    def cls(self, col):
+        self.calls.append(("cls", (col,)))
+
+    def rect(self, x, y, w, h, col):
+        self.calls.append(("rect", (x, y, w, h, col)))
+
+    def text(self, x, y, s, col):
+        self.calls.append(("text", (x, y, s, col)))
+
+    def blt(self, x, y, img, u, v, w, h, colkey=None):
+        self.calls.append(("blt", (x, y, img, u, v, w, h, colkey)))
+
+
+def keys_to_codes(keys):
+    # Accept None/"" for an idle frame, "C" or "C+SPACE" by name, or an iterable of key codes
+    if not keys:
+        return frozenset()
+    if isinstance(keys, str):
+        return frozenset(KEY_CODES[name.strip().upper()] for name in keys.split("+"))
+    return frozenset(keys)
+
+
+def idle(frames):
+    # Helper for scripts: a run of frames with no keys pressed
+    return [""] * frames
+
+
+class use_backend:
+    # Context manager that points every game module at the given backend
+    def __init__(self, backend):
+        self.backend = backend
+        self.saved = []
+
+    def __enter__(self):
+        self.saved = [(module, module.pyxel) for module in GAME_MODULES]
+        for module in GAME_MODULES:
+            module.pyxel = self.backend
+        return self.backend
+
+    def __exit__(self, *exc_info):
+        for module, previous in self.saved:
+            module.pyxel = previous
+        self.saved = []
+        return False
+
+
+def run_headless(game_class, inputs, backend=None, exit_callback=None, draw_frames=True, seed=None):
+    # Construct a stage against the headless backend and replay the scripted inputs through it.
+    # The same seed and inputs always produce the same session.
+    backend = backend or HeadlessPyxel()
+    with use_backend(backend):
+        game = game_class(exit_callback or (lambda: None), seed=seed)
+        backend.play(game.update, game.draw, inputs, draw_frames)
+    return game
+
+
+# Simple load test: replay a scripted session through every stage and report throughput
+def main(sessions=1000):
+    scripts = {
+        color_theory_game.ColorTheoryGame: ["C", "C", "C", ""] + ["P", "C", "S", "C"] * 10 + ["E"],
+        color_mixing_game.ColorMixingGame: ["C"] + ["T", "C", "F", "C"] * 10 + ["E"],
+        warm_cool_game.WarmCoolColorTheoryGame: ["C", "C", "C", "C", "C"] + ["L", "C", "W", "C"] * 10 + ["E"],
+        warm_cool_game.QuizGame: ["C", "C", "C"] + ["L", "C", "W", "C"] * 10 + ["E"],
+    }
+    backend = HeadlessPyxel()
+    for game_class, script in scripts.items():
+        started = time.perf_counter()
+        for _ in range(sessions):
+            run_headless(game_class, script, backend)
+        elapsed = time.perf_counter() - started
+        print(f"{game_class.__name__}: {sessions / elapsed:,.0f} sessions/s ({sessions * len(script) / elapsed:,.0f} frames/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+import queue
+import time
+
+# Running totals for the dashboard's live monitor: one row per session with its score and answer
+# rate. Stages report from the Pyxel thread, and in process mode the dashboard relays worker
+# messages, but every report only puts an event on a thread-safe queue. The Tk thread drains the
+# queue in batches from a root.after timer, folds the events into per-session totals and redraws
+# each changed row once per drain, however many events arrived for it.
+
+REFRESH_MS = 200  # Delay between drains while the queue keeps up
+BATCH_SIZE = 2000  # Events folded per drain; a longer backlog continues on the next turn of the Tk loop
+RATE_REFRESH = 1.0  # Seconds between redraws of running rows whose rate moved only because time passed
+COLUMNS = (("learner", "Learner"), ("stage", "Stage"), ("success", "Success"), ("failed", "Failed"),
+           ("accuracy", "Accuracy"), ("rate", "Answers/min"), ("status", "Status"))
+
+
+class SessionStats:
+    def __init__(self, title, learner, started):
+        self.title = title
+        self.learner = learner
+        self.started = started
+        self.ended = None
+        self.success = 0
+        self.failed = 0
+
+    def row(self, now):
+        # Treeview values in COLUMNS order
+        answers = self.success + self.failed
+        elapsed = max((self.ended or now) - self.started, 1.0)
+        accuracy = f"{self.success / answers:.0%}" if answers else "-"
+        return (self.learner, self.title, self.success, self.failed, accuracy,
+                f"{answers * 60 / elapsed:.1f}", "Running" if self.ended is None else "Ended")
+
+
+class LiveStats:
+    def __init__(self):
+        self.events = queue.SimpleQueue()
+        self.sessions = {}  # Session id -> SessionStats, in the order they began
+        self.active_session = None  # Session that answers reported by the stages belong to
+        self.dirty = set()  # Sessions changed since their row was last drawn
+        self.shown = {}  # Session id -> row values last drawn
+        self.last_rate_refresh = 0.0
+
+    def start(self):
+        # Listen to the stages in this process. game_host brings in Pyxel, so it is only imported
+        # once a stage is launched here; calling start again is harmless.
+        import game_host
+        if self not in game_host.answer_listeners:
+            game_host.answer_listeners.append(self)
+        return self
+
+    def close(self):
+        import game_host
+        if self in game_host.answer_listeners:
+            game_host.answer_listeners.remove(self)
+
+    # Producers; safe from any thread, they only queue an event
+    def begin(self, session_id, title, learner):
+        self.active_session = session_id
+        self.events.put(("begin", session_id, (title, learner, time.time())))
+
+    def end(self, session_id, success=None, failed=None):
+        # Without totals the session keeps the answers counted so far
+        if self.active_session == session_id:
+            self.active_session = None
+        self.events.put(("end", session_id, (success, failed, time.time())))
+
+    def score(self, session_id, success, failed):
+        # Totals sent by a stage in a worker process, whose answers stay in the worker
+        self.events.put(("score", session_id, (success, failed)))
+
+    def __call__(self, stage, colors, answer, correct, frames):
+        # Answer listener, called from the frame loop
+        session_id = self.active_session
+        if session_id is not None:
+            self.events.put(("answer", session_id, correct))
+
+    # Consumer, on the Tk thread
+    def drain(self, limit=BATCH_SIZE):
+        # Fold up to limit queued events into the totals; True if the queue may hold more
+        events = self.events
+        sessions = self.sessions
+        dirty = self.dirty
+        for _ in range(limit):
+            try:
+                kind, session_id, data = events.get_nowait()
+            except queue.Empty:
+                return False
+            if kind == "begin":
+                sessions[session_id] = SessionStats(*data)
+            else:
+                stats = sessions.get(session_id)
+                if stats is None:
+                    continue
+                if kind == "answer":
+                    if data:
+                        stats.success += 1
+                    else:
+                        stats.failed += 1
+                elif kind == "score":
+                    stats.success, stats.failed = data
+                else:
+                    success, failed, stats.ended = data
+                    if success is not None and failed is not None:
+                        stats.success, stats.failed = success, failed
+            dirty.add(session_id)
+        return True
+
+    def changed_rows(self, now=None):
+        # Session id -> row values for the rows that look different from when they were last drawn
+        now = time.time() if now is None else now
+        candidates = self.dirty
+        self.dirty = set()
+        if now - self.last_rate_refresh >= RATE_REFRESH:
+            self.last_rate_refresh = now
+            candidates |= {session_id for session_id, stats in self.sessions.items() if stats.ended is None}
+        changed = {}
+        for session_id in candidates:
+            row = self.sessions[session_id].row(now)
+            if self.shown.get(session_id) != row:
+                self.shown[session_id] = changed[session_id] = row
+        return changed
+
+    def summary(self, now=None):
+        # Status line: running sessions and their combined answer rate
+        now = time.time() if now is None else now
+        running = [stats for stats in self.sessions.values() if stats.ended is None]
+        rate = sum((stats.success + stats.failed) * 60 / max(now - stats.started, 1.0) for stats in running)
+        return f"Running: {len(running)}  Answers/min: {rate:.1f}"
@@ -0,0 +1,166 @@
+from collections import OrderedDict, deque
+from types import MappingProxyType
+
+# Shared, read-only palette registry for all stages.
+# Lookups are precomputed dict hits instead of list scans on every draw call.
+
+# Names for every 24-bit RGB value the stages display
+COLOR_NAMES = MappingProxyType({
+    0xffff00: "Yellow",
+    0xff0000: "Red",
+    0x0000ff: "Blue",
+    0x00ff00: "Green",
+    0xffa500: "Orange",
+    0x8a2be2: "Violet",
+    0xff4500: "Red-Orange",
+    0xffd700: "Yellow-Orange",
+    0xc71585: "Red-Violet",
+    0x4b0082: "Blue-Violet",
+    0x00ced1: "Blue-Green",
+    0x008000: "Green",
+    0x9acd32: "Yellow-Green",
+})
+
+
+PALETTE_SLOTS = 16  # Colors in Pyxel's palette
+TEXT_SLOT = 7  # pyxel.COLOR_WHITE, which the stages draw text in; always white
+
+
+class Palette:
+    # One Pyxel palette: black at index 0 followed by the stage colors, skipping TEXT_SLOT
+    __slots__ = ("colors", "indices")
+
+    def __init__(self, colors):
+        self.colors = (0x000000,) + tuple(colors)
+        if len(self.colors) > TEXT_SLOT:
+            self.colors = self.colors[:TEXT_SLOT] + (0xffffff,) + self.colors[TEXT_SLOT:]
+        indices = {}
+        for index, color in enumerate(self.colors):
+            indices.setdefault(color, index)  # Keep the first slot if a color repeats, like list.index
+        self.indices = MappingProxyType(indices)
+
+    def index(self, color):
+        # Return the index of the color in Pyxel's palette, defaulting to black
+        return self.indices.get(color, 0)
+
+    def name(self, color):
+        # Stage colors keep their own names; anything else, like a mixed color, gets the nearest named one
+        name = COLOR_NAMES.get(color)
+        if name is None:
+            from color_naming import color_name  # Imported on first use: it loads NumPy and the name dataset
+            name = color_name(color)
+        return name
+
+    def __contains__(self, color):
+        return color in self.indices
+
+    def to_list(self):
+        # Fresh list for pyxel.colors.from_list
+        return list(self.colors)
+
+
+starting_palettes = {}  # (Palette, slots) -> slot colors an allocator starts from, shared by every session
+
+
+def starting_colors(base, slots):
+    colors = starting_palettes.get((base, slots))
+    if colors is None:
+        colors = base.colors + tuple(0xffffff if slot == TEXT_SLOT else 0x000000 for slot in range(len(base.colors), slots))
+        starting_palettes[(base, slots)] = colors
+    return colors
+
+
+class PaletteAllocator:
+    # A stage's live palette. The colors of a shared Palette keep their slots; any other 24-bit color
+    # is given a free slot the first time it is drawn, and once they are all taken the color drawn
+    # least recently gives its slot up. A color drawn this frame keeps its slot, since Pyxel applies
+    # the palette when the frame is shown; with no slot to spare the nearest loaded color is used.
+    # Changes are collected and handed to Pyxel at most once per frame through take_upload().
+    # names (color -> name), e.g. from a content pack, take precedence over the shared names.
+    # Most sessions only ever draw base colors, so the slot bookkeeping is created on the first
+    # allocation and until then colors is the shared starting tuple.
+    __slots__ = ("base", "names", "colors", "free", "recent", "drawn", "frame", "changed", "uploads")
+
+    def __init__(self, base, slots=PALETTE_SLOTS, names=None):
+        self.base = base
+        self.names = names or {}
+        self.colors = starting_colors(base, slots)
+        self.free = None
+        self.recent = None  # Color -> slot for colors not in base, least recently drawn first
+        self.drawn = None  # Frame each slot was last drawn in
+        self.frame = 0
+        self.changed = False
+        self.uploads = 0
+
+    def index(self, color):
+        slot = self.base.indices.get(color)
+        if slot is not None:
+            return slot
+        slot = self.recent.get(color) if self.recent is not None else None
+        if slot is None:
+            slot = self.allocate(color)
+        else:
+            self.recent.move_to_end(color)
+        self.drawn[slot] = self.frame
+        return slot
+
+    def allocate(self, color):
+        if self.recent is None:
+            slots = len(self.colors)
+            self.colors = list(self.colors)
+            self.free = deque(slot for slot in range(len(self.base.colors), slots) if slot != TEXT_SLOT)
+            self.recent = OrderedDict()
+            self.drawn = [-1] * slots
+        if self.free:
+            slot = self.free.popleft()
+        else:
+            oldest = next(iter(self.recent), None)
+            if oldest is None or self.drawn[self.recent[oldest]] == self.frame:
+                return self.nearest(color)
+            slot = self.recent.pop(oldest)
+        self.recent[color] = slot
+        self.colors[slot] = color
+        self.changed = True
+        return slot
+
+    def nearest(self, color):
+        # Slot of the loaded color closest in RGB, for when every slot is in use this frame
+        def distance(slot):
+            other = self.colors[slot]
+            return sum((((color >> shift) & 0xff) - ((other >> shift) & 0xff)) ** 2 for shift in (16, 8, 0))
+        return min(range(len(self.colors)), key=distance)
+
+    def name(self, color):
+        name = self.names.get(color)
+        return name if name is not None else self.base.name(color)
+
+    def __contains__(self, color):
+        return color in self.base or (self.recent is not None and color in self.recent)
+
+    def to_list(self):
+        # Fresh list for pyxel.colors.from_list
+        return list(self.colors)
+
+    def take_upload(self):
+        # Called once at the end of each frame's drawing: the colors to load if any slot changed, else None
+        self.frame += 1
+        if not self.changed:
+            return None
+        self.changed = False
+        self.uploads += 1
+        return self.to_list()
+
+
+# Yellow, Red, Blue, then Green, Orange, Violet; used by the primary/secondary and mixing stages
+PRIMARY_SECONDARY_PALETTE = Palette([0xffff00, 0xff0000, 0x0000ff, 0x00ff00, 0xffa500, 0x8a2be2])
+
+# Warm colors (red-violet to yellow) then cool colors (violet to yellow-green), white text between them
+WARM_COOL_PALETTE = Palette([
+    0xc71585, 0xff0000, 0xff4500, 0xffa500, 0xffd700, 0xffff00,
+    0x8a2be2, 0x4b0082, 0x0000ff, 0x00ced1, 0x008000, 0x9acd32,
+])
+
+PALETTES = MappingProxyType({
+    "primary_secondary": PRIMARY_SECONDARY_PALETTE,
+    "warm_cool": WARM_COOL_PALETTE,
+})
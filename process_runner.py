@@ -0,0 +1,134 @@
+import multiprocessing
+import os
+from multiprocessing.connection import wait
+
+from content_packs import list_packs
+
+# Workers run content packs, sent by pack name and looked up inside the worker so messages stay picklable
+
+
+def stage_score(game):
+    # WarmCoolColorTheoryGame keeps its score on the nested quiz once the quiz has started
+    game = getattr(game, "quiz_game", None) or game
+    return getattr(game, "success", 0), getattr(game, "failed", 0)
+
+
+class WorkerHost:
+    # Minimal host for a worker process: the window belongs to the worker, and the stage
+    # exiting reports back to the dashboard before the worker shuts Pyxel down
+    def __init__(self, connection, stage_name, answer_log=None):
+        self.connection = connection
+        self.stage_name = stage_name
+        self.answer_log = answer_log
+        self.game = None
+        self.finished = False
+
+    def stage_finished(self):
+        import pyxel
+        if self.finished:
+            return
+        self.finished = True
+        success, failed = stage_score(self.game) if self.game is not None else (0, 0)
+        self.connection.send(("exit", self.stage_name, success, failed))
+        if self.answer_log is not None:
+            self.answer_log.close()  # Quitting Pyxel ends the process, so write out the buffered answers first
+        pyxel.quit()
+
+
+def worker_main(connection):
+    # Import Pyxel and the stages before the launch request arrives, so a launch is warm
+    import pyxel
+    import game_host
+    import GameUI
+    from answer_log import AnswerLog, answer_log_path
+    from color_classes import preload_table
+
+    preload_table()
+    stage_classes = {stage: GameUI.load_stage(stage) for stage in list_packs()}
+
+    message = connection.recv()
+    if message[0] != "launch":
+        return
+    stage_name = message[1]
+
+    host = WorkerHost(connection, stage_name, AnswerLog(answer_log_path()).start())  # The stage's answers stay in this process
+    pyxel.init(game_host.SCREEN_WIDTH, game_host.SCREEN_HEIGHT, title="Color Games", quit_key=pyxel.KEY_NONE)
+    game_host.active_host = host
+    game_host.recordings_dir = os.environ.get("COLOR_GAMES_RECORD")  # Workers inherit the dashboard's environment
+    game, stage_update = game_host.create_stage(stage_classes[stage_name], lambda: None)
+    host.game = game
+    connection.send(("started", stage_name, 0, 0))
+
+    last_score = (0, 0)
+
+    def update():
+        nonlocal last_score
+        stage_update()
+        score = stage_score(game)
+        if score != last_score and not host.finished:
+            last_score = score
+            connection.send(("score", stage_name) + score)
+
+    pyxel.run(*game_host.frame_callbacks(update, game.draw, game.view_state))
+
+
+# Pool of pre-started worker processes. Each launch takes a warm worker and a replacement is
+# started straight away, so the next launch does not pay for interpreter and Pyxel start-up.
+class ProcessRunner:
+    def __init__(self, pool_size=1):
+        self.context = multiprocessing.get_context("spawn")
+        self.pool_size = pool_size
+        self.idle = []
+        self.running = {}  # Dashboard end of the pipe -> (process, stage name)
+        self.fill_pool()
+
+    def fill_pool(self):
+        while len(self.idle) < self.pool_size:
+            parent_end, child_end = self.context.Pipe()
+            process = self.context.Process(target=worker_main, args=(child_end,), daemon=True)
+            process.start()
+            child_end.close()
+            self.idle.append((process, parent_end))
+
+    def launch(self, stage_name):
+        if stage_name not in list_packs():
+            raise ValueError(f"Unknown stage: {stage_name}")
+        process, connection = self.idle.pop(0)
+        connection.send(("launch", stage_name))
+        self.running[connection] = (process, stage_name)
+        self.fill_pool()
+
+    def poll(self, timeout=0):
+        # Return the (event, stage name, success, failed) tuples the workers have sent so far
+        events = []
+        if not self.running:
+            return events
+        for connection in wait(list(self.running), timeout):
+            process, stage_name = self.running[connection]
+            try:
+                while connection.poll():
+                    event = connection.recv()
+                    events.append(event)
+                    if event[0] == "exit":
+                        self.release(connection)
+                        break
+            except (EOFError, OSError):
+                # The worker died or its window was closed without a clean exit
+                events.append(("exit", stage_name, None, None))
+                self.release(connection)
+        return events
+
+    def release(self, connection):
+        process, _ = self.running.pop(connection)
+        connection.close()
+        process.join(timeout=1)
+
+    def shutdown(self):
+        for process, connection in self.idle:
+            connection.send(("close",))
+            connection.close()
+        for connection, (process, _) in list(self.running.items()):
+            process.terminate()
+            connection.close()
+        self.idle = []
+        self.running = {}
@@ -0,0 +1,11 @@
+# Full question pools, built once per process and shared by every session of a stage
+question_pools = {}
+
+
+def question_pool(key, build):
+    # Return the cached pool for a stage, building it on first use from build()
+    pool = question_pools.get(key)
+    if pool is None:
+        pool = question_pools[key] = tuple(build())
+    return pool
+
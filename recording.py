@@ -0,0 +1,143 @@
+import os
+import random
+import struct
+import sys
+import time
+
+import pyxel
+
+from screen_machine import INPUT_KEYS
+
+# Input recordings of stage sessions. A stage is deterministic given its seed and the keys down on
+# each frame, so that is all a recording keeps; replaying it through the headless backend reproduces
+# the session exactly, as fast as the stage can run.
+# The file is a 4-byte magic, a header and one record per frame that had a key down:
+#   header  seed, frames recorded, then the pack name and the recorded key names (comma separated),
+#           each as a 2-byte length and UTF-8 text
+#   record  frame index, bit mask of the keys down (bit i is the i-th key name)
+MAGIC = b"CGR1"
+HEADER = struct.Struct("<QI")
+LENGTH = struct.Struct("<H")
+RECORD = struct.Struct("<IH")
+
+
+def new_seed():
+    return random.SystemRandom().getrandbits(32)
+
+
+class Recording:
+    def __init__(self, pack, seed, frames=0, events=(), keys=INPUT_KEYS):
+        self.pack = pack
+        self.seed = seed
+        self.frames = frames
+        self.events = list(events)  # (frame, key mask) for each frame with a key down, in frame order
+        self.keys = tuple(keys)
+
+    def inputs(self):
+        # Per-frame key codes for HeadlessPyxel.play: an empty tuple for every frame without input
+        import headless
+        codes = [headless.KEY_CODES[name] for name in self.keys]
+        inputs = [()] * self.frames
+        for frame, mask in self.events:
+            inputs[frame] = tuple(code for bit, code in enumerate(codes) if mask >> bit & 1)
+        return inputs
+
+    def save(self, path):
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(partial, "wb") as recording_file:
+            recording_file.write(MAGIC + HEADER.pack(self.seed, self.frames))
+            for text in (self.pack, ",".join(self.keys)):
+                data = text.encode("utf-8")
+                recording_file.write(LENGTH.pack(len(data)) + data)
+            recording_file.write(b"".join(RECORD.pack(frame, mask) for frame, mask in self.events))
+        os.replace(partial, path)  # A crash mid-save leaves no half-written recording behind
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as recording_file:
+            data = recording_file.read()
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not an input recording")
+        offset = len(MAGIC)
+        seed, frames = HEADER.unpack_from(data, offset)
+        offset += HEADER.size
+        texts = []
+        for _ in range(2):
+            (length,) = LENGTH.unpack_from(data, offset)
+            offset += LENGTH.size
+            texts.append(data[offset:offset + length].decode("utf-8"))
+            offset += length
+        pack, keys = texts
+        return cls(pack, seed, frames, RECORD.iter_unpack(data[offset:]), keys.split(","))
+
+
+class InputRecorder:
+    # Records one stage session in a live window and saves it to directory once the stage exits.
+    # wrap() the stage's update so the keys are sampled with btnp once per frame, before the stage
+    # samples them itself.
+    def __init__(self, pack, seed, directory, exit_key="E"):
+        self.recording = Recording(pack, seed)
+        self.directory = directory
+        self.key_codes = [getattr(pyxel, "KEY_" + name) for name in INPUT_KEYS]
+        self.exit_mask = 1 << INPUT_KEYS.index(exit_key)
+        self.path = None
+
+    def capture(self):
+        # Record this frame's keys; returns their mask
+        recording = self.recording
+        btnp = pyxel.btnp
+        mask = 0
+        for bit, key in enumerate(self.key_codes):
+            if btnp(key):
+                mask |= 1 << bit
+        if mask:
+            recording.events.append((recording.frames, mask))
+        recording.frames += 1
+        return mask
+
+    def wrap(self, update):
+        def recorded_update():
+            if self.capture() & self.exit_mask:
+                # Save before the stage handles its exit key: outside GameHost, quitting Pyxel ends the process
+                self.save()
+            update()
+        return recorded_update
+
+    def save(self):
+        # Save once, under a name that sorts by time and tells the pack and seed; returns the path
+        if self.path is None:
+            recording = self.recording
+            os.makedirs(self.directory, exist_ok=True)
+            self.path = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{recording.pack}-{recording.seed:08x}.rec")
+            recording.save(self.path)
+        return self.path
+
+
+def replay(recording, game_class=None, backend=None, draw_frames=False):
+    # Feed a recording through a stage headlessly, as fast as it runs; by default the stage of the
+    # recorded pack. Returns the stage as it was when the recording ends.
+    from content_packs import stage_class
+    from headless import run_headless
+    game_class = game_class or stage_class(recording.pack)
+    return run_headless(game_class, recording.inputs(), backend, draw_frames=draw_frames, seed=recording.seed)
+
+
+# Replay recordings, e.g. a learner's bug report or a class session used as load:
+# python recording.py session.rec [more.rec ...]
+def main(paths):
+    from headless import HeadlessPyxel
+    from process_runner import stage_score
+    backend = HeadlessPyxel()
+    for path in paths:
+        recording = Recording.load(path)
+        started = time.perf_counter()
+        game = replay(recording, backend=backend, draw_frames=True)
+        elapsed = time.perf_counter() - started
+        success, failed = stage_score(game)
+        print(f"{os.path.basename(path)}: {recording.pack}, seed {recording.seed}, {recording.frames} frames "
+              f"in {elapsed * 1000:.1f} ms ({recording.frames / max(elapsed, 1e-9):,.0f} frames/s); "
+              f"screen {game.screen}, success {success}, failed {failed}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
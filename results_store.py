@@ -0,0 +1,180 @@
+import queue
+import sqlite3
+import threading
+import time
+
+import game_host
+
+# Learner profiles, sessions and answers for a classroom, kept in one SQLite file.
+# The database runs in WAL mode so the dashboard can read while a background thread writes;
+# all writes from the game go through a queue and are inserted in batches.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS learners (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    learner_id INTEGER NOT NULL REFERENCES learners(id),
+    stage TEXT NOT NULL,
+    started REAL NOT NULL,
+    ended REAL,
+    success INTEGER NOT NULL DEFAULT 0,
+    failed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS answers (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    learner_id INTEGER NOT NULL REFERENCES learners(id),
+    stage TEXT NOT NULL,
+    color INTEGER NOT NULL,
+    color2 INTEGER NOT NULL DEFAULT 0,
+    answer INTEGER,
+    correct INTEGER NOT NULL,
+    frames INTEGER NOT NULL,
+    timestamp REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_by_learner ON sessions (learner_id, started);
+CREATE INDEX IF NOT EXISTS answers_by_session ON answers (session_id);
+CREATE INDEX IF NOT EXISTS answers_by_learner_color ON answers (learner_id, color);
+CREATE INDEX IF NOT EXISTS answers_by_color ON answers (color, correct);
+"""
+
+INSERT_SESSION = "INSERT INTO sessions (id, learner_id, stage, started) VALUES (?, ?, ?, ?)"
+INSERT_ANSWER = ("INSERT INTO answers (session_id, learner_id, stage, color, color2, answer, correct, frames, timestamp) "
+                 "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+END_SESSION = ("UPDATE sessions SET ended = ?, "
+               "success = (SELECT COUNT(*) FROM answers WHERE session_id = sessions.id AND correct = 1), "
+               "failed = (SELECT COUNT(*) FROM answers WHERE session_id = sessions.id AND correct = 0) "
+               "WHERE id = ?")
+END_SESSION_WITH_TOTALS = "UPDATE sessions SET ended = ?, success = ?, failed = ? WHERE id = ?"
+WRITES = {"session": INSERT_SESSION, "answer": INSERT_ANSWER, "end": END_SESSION, "totals": END_SESSION_WITH_TOTALS}
+
+
+def connect(path):
+    connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class ResultsStore:
+    def __init__(self, path, batch_size=500, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.writes = queue.Queue()
+        self.lock = threading.Lock()
+        self.reader = connect(path)
+        with self.reader:
+            self.reader.executescript(SCHEMA)
+        self.next_session_id = (self.reader.execute("SELECT MAX(id) FROM sessions").fetchone()[0] or 0) + 1
+        self.active_session = None  # (session id, learner id) that incoming answers belong to
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        game_host.answer_listeners.append(self)
+        return self
+
+    def close(self):
+        if self in game_host.answer_listeners:
+            game_host.answer_listeners.remove(self)
+        if self.thread is not None:
+            self.writes.put(None)
+            self.thread.join()
+            self.thread = None
+        self.reader.close()
+
+    def learner_id(self, name):
+        # Learner profiles are created rarely, so this one write happens synchronously
+        with self.lock, self.reader:
+            self.reader.execute("INSERT OR IGNORE INTO learners (name, created) VALUES (?, ?)", (name, time.time()))
+            return self.reader.execute("SELECT id FROM learners WHERE name = ?", (name,)).fetchone()[0]
+
+    def begin_session(self, learner, stage):
+        learner_id = self.learner_id(learner)
+        with self.lock:
+            session_id = self.next_session_id
+            self.next_session_id += 1
+        self.writes.put(("session", (session_id, learner_id, stage, time.time())))
+        self.active_session = (session_id, learner_id)
+        return session_id
+
+    def end_session(self, session_id, success=None, failed=None):
+        # Without explicit totals, success and failed are counted from the session's answers by the writer.
+        # Stages run in worker processes report totals instead, since their answers stay in the worker.
+        if self.active_session is not None and self.active_session[0] == session_id:
+            self.active_session = None
+        if success is None or failed is None:
+            self.writes.put(("end", (time.time(), session_id)))
+        else:
+            self.writes.put(("totals", (time.time(), success, failed, session_id)))
+
+    # Answer listener, called from the frame loop
+    def __call__(self, stage, colors, answer, correct, frames):
+        if self.active_session is None:
+            return
+        session_id, learner_id = self.active_session
+        color2 = colors[1] if len(colors) > 1 else 0
+        self.writes.put(("answer", (session_id, learner_id, stage, colors[0], color2,
+                                    None if answer is None else int(answer), int(correct), frames, time.time())))
+
+    def run(self):
+        connection = connect(self.path)
+        running = True
+        while running:
+            try:
+                batch = [self.writes.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.writes.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = batch[:batch.index(None)]
+            self.write_batch(connection, batch)
+        connection.close()
+
+    def write_batch(self, connection, batch):
+        # One transaction per batch, with consecutive writes of the same kind sent as one executemany
+        with connection:
+            start = 0
+            while start < len(batch):
+                kind = batch[start][0]
+                end = start
+                while end < len(batch) and batch[end][0] == kind:
+                    end += 1
+                connection.executemany(WRITES[kind], [row for _, row in batch[start:end]])
+                start = end
+
+    # Dashboard queries; the indexes keep these fast for a class of several hundred learners
+    def class_summary(self):
+        # (learner, sessions, success, failed, last played) for every learner, most recent first
+        return self.reader.execute(
+            "SELECT learners.name, COUNT(sessions.id), COALESCE(SUM(sessions.success), 0), "
+            "COALESCE(SUM(sessions.failed), 0), MAX(sessions.started) "
+            "FROM learners LEFT JOIN sessions ON sessions.learner_id = learners.id "
+            "GROUP BY learners.id ORDER BY MAX(sessions.started) DESC").fetchall()
+
+    def learner_sessions(self, name, limit=50):
+        # (stage, started, ended, success, failed) for one learner's most recent sessions
+        return self.reader.execute(
+            "SELECT sessions.stage, sessions.started, sessions.ended, sessions.success, sessions.failed "
+            "FROM sessions JOIN learners ON learners.id = sessions.learner_id "
+            "WHERE learners.name = ? ORDER BY sessions.started DESC LIMIT ?", (name, limit)).fetchall()
+
+    def color_stats(self, name=None):
+        # (color, answers, correct, average frames) per color, for one learner or the whole class
+        if name is None:
+            return self.reader.execute(
+                "SELECT color, COUNT(*), SUM(correct), AVG(frames) FROM answers GROUP BY color").fetchall()
+        return self.reader.execute(
+            "SELECT color, COUNT(*), SUM(correct), AVG(frames) FROM answers "
+            "WHERE learner_id = (SELECT id FROM learners WHERE name = ?) GROUP BY color", (name,)).fetchall()
@@ -0,0 +1,172 @@
+from itertools import combinations
+from types import MappingProxyType
+
+import numpy as np
+
+from palette import COLOR_NAMES
+
+# Paint-style color mixing in RYB (red, yellow, blue pigment) space. A color is an amount of each
+# pigment from 0 to 1; mixing adds the pigments in proportion and rescales so the strongest is 1,
+# which is how red and blue make violet rather than the black an RGB multiply would give.
+# Pigment amounts are turned back into RGB by trilinear interpolation over the RYB cube.
+
+# RGB at the corners of the RYB cube, indexed [red][yellow][blue], from Gosset & Chen,
+# "Paint Inspired Color Mixing and Compositing for Visualization"
+RYB_CORNERS = np.array([
+    [[(1.0, 1.0, 1.0), (0.163, 0.373, 0.6)],  # white, blue
+     [(1.0, 1.0, 0.0), (0.0, 0.66, 0.2)]],  # yellow, green
+    [[(1.0, 0.0, 0.0), (0.5, 0.0, 0.5)],  # red, purple
+     [(1.0, 0.5, 0.0), (0.2, 0.094, 0.0)]],  # orange, black
+])
+
+# Pigment amounts for the twelve colors of the RYB color wheel, plus the brown that mixing
+# complementary colors gives. Names match palette.COLOR_NAMES.
+WHEEL = MappingProxyType({
+    "Red": (1.0, 0.0, 0.0),
+    "Red-Orange": (1.0, 0.5, 0.0),
+    "Orange": (1.0, 1.0, 0.0),
+    "Yellow-Orange": (0.5, 1.0, 0.0),
+    "Yellow": (0.0, 1.0, 0.0),
+    "Yellow-Green": (0.0, 1.0, 0.5),
+    "Green": (0.0, 1.0, 1.0),
+    "Blue-Green": (0.0, 0.5, 1.0),
+    "Blue": (0.0, 0.0, 1.0),
+    "Blue-Violet": (0.5, 0.0, 1.0),
+    "Violet": (1.0, 0.0, 1.0),
+    "Red-Violet": (1.0, 0.0, 0.5),
+    "Brown": (1.0, 1.0, 1.0),
+})
+WHEEL_NAMES = tuple(WHEEL)
+WHEEL_RYB = np.array(list(WHEEL.values()))
+
+GRID_STEPS = 17  # Resolution of the RYB grid used to place colors that are not on the wheel
+ryb_grid = {}  # Built on first use: "ryb" and "rgb" arrays for every grid point
+
+
+def unpack_rgb(colors):
+    # 24-bit RGB integers to an (..., 3) float array in 0..1
+    colors = np.asarray(colors, dtype=np.int64)
+    return np.stack([(colors >> 16) & 0xff, (colors >> 8) & 0xff, colors & 0xff], axis=-1) / 255.0
+
+
+def pack_rgb(rgb):
+    channels = np.clip(np.rint(np.asarray(rgb) * 255), 0, 255).astype(np.int64)
+    return (channels[..., 0] << 16) | (channels[..., 1] << 8) | channels[..., 2]
+
+
+def ryb_to_rgb(ryb):
+    # Trilinear interpolation over the cube corners; ryb is an (..., 3) array of pigment amounts
+    ryb = np.asarray(ryb, dtype=float)
+    r, y, b = (ryb[..., axis, None] for axis in range(3))
+    corners = RYB_CORNERS
+    front = (corners[0, 0, 0] * (1 - b) + corners[0, 0, 1] * b) * (1 - y) + (corners[0, 1, 0] * (1 - b) + corners[0, 1, 1] * b) * y
+    back = (corners[1, 0, 0] * (1 - b) + corners[1, 0, 1] * b) * (1 - y) + (corners[1, 1, 0] * (1 - b) + corners[1, 1, 1] * b) * y
+    return front * (1 - r) + back * r
+
+
+def grid():
+    if not ryb_grid:
+        steps = np.linspace(0.0, 1.0, GRID_STEPS)
+        points = np.stack(np.meshgrid(steps, steps, steps, indexing="ij"), axis=-1).reshape(-1, 3)
+        ryb_grid["ryb"] = points
+        ryb_grid["rgb"] = ryb_to_rgb(points)
+        ryb_grid["norms"] = (ryb_grid["rgb"] ** 2).sum(axis=1)
+    return ryb_grid["ryb"], ryb_grid["rgb"], ryb_grid["norms"]
+
+
+# Wheel colors by 24-bit RGB value, so the palette colors mix exactly as the color wheel says.
+# Also kept as sorted arrays for bulk lookups.
+NAMED_RYB = MappingProxyType({color: WHEEL[name] for color, name in COLOR_NAMES.items() if name in WHEEL})
+NAMED_COLORS = np.array(sorted(NAMED_RYB), dtype=np.int64)
+NAMED_COLORS_RYB = np.array([NAMED_RYB[color] for color in NAMED_COLORS.tolist()])
+
+
+def rgb_to_ryb(colors, chunk=1024):
+    # Pigment amounts for 24-bit RGB colors: wheel colors from the table, anything else from the
+    # nearest point of the interpolated cube
+    colors = np.asarray(colors, dtype=np.int64)
+    flat = colors.reshape(-1)
+    slots = np.minimum(np.searchsorted(NAMED_COLORS, flat), len(NAMED_COLORS) - 1)
+    known = NAMED_COLORS[slots] == flat
+    result = NAMED_COLORS_RYB[slots]
+    unknown = np.flatnonzero(~known)
+    if unknown.size:
+        grid_ryb, grid_rgb, grid_norms = grid()
+        rgb = unpack_rgb(flat[unknown])
+        for start in range(0, unknown.size, chunk):
+            # Squared distance up to a per-row constant: |grid|^2 - 2 rgb.grid
+            distances = grid_norms - 2 * (rgb[start:start + chunk] @ grid_rgb.T)
+            result[unknown[start:start + chunk]] = grid_ryb[distances.argmin(axis=1)]
+    return result.reshape(colors.shape + (3,))
+
+
+def mix_ryb(first, second, ratio=0.5):
+    # Mix ratio parts of first with 1 - ratio parts of second; all arguments broadcast
+    ratio = np.asarray(ratio, dtype=float)[..., None]
+    mixed = np.asarray(first) * ratio + np.asarray(second) * (1 - ratio)
+    strongest = mixed.max(axis=-1, keepdims=True)
+    return np.divide(mixed, strongest, out=np.zeros_like(mixed), where=strongest > 0)
+
+
+def wheel_index(ryb):
+    # Index into WHEEL_NAMES of the wheel color nearest to each pigment mix
+    ryb = np.asarray(ryb, dtype=float)
+    distances = ((ryb[..., None, :] - WHEEL_RYB) ** 2).sum(axis=-1)
+    return distances.argmin(axis=-1)
+
+
+def mix_colors(first, second, ratio=0.5):
+    # Bulk mixing of 24-bit RGB colors: returns (RGB of each mix, WHEEL_NAMES index of its name)
+    ryb = mix_ryb(rgb_to_ryb(first), rgb_to_ryb(second), ratio)
+    return pack_rgb(ryb_to_rgb(ryb)), wheel_index(ryb)
+
+
+def mixing_questions(rng, count, colors, ratios=None):
+    # Random mixing questions over colors, for generating quizzes in bulk: two different colors and
+    # the ratio of the first, drawn uniformly from 0.25-0.75 unless ratios lists the choices.
+    # Returns (first, second, ratio, result name index) arrays.
+    colors = np.asarray(colors, dtype=np.int64)
+    colors_ryb = rgb_to_ryb(colors)  # Once per color rather than once per question
+    first = rng.integers(len(colors), size=count)
+    second = (first + rng.integers(1, len(colors), size=count)) % len(colors)
+    if ratios is None:
+        ratio = rng.uniform(0.25, 0.75, size=count)
+    else:
+        ratio = rng.choice(np.asarray(ratios, dtype=float), size=count)
+    names = wheel_index(mix_ryb(colors_ryb[first], colors_ryb[second], ratio))
+    return colors[first], colors[second], ratio, names
+
+
+def build_pair_mixes(colors):
+    # (first, second) -> (RGB, name) for every ordered pair of colors mixed half and half.
+    # A mix that lands on a wheel color takes that color's palette RGB so it draws like the original.
+    canonical = {}
+    for color, name in COLOR_NAMES.items():
+        canonical.setdefault(name, color)
+    colors = list(colors)
+    first = np.repeat(colors, len(colors))
+    second = np.tile(colors, len(colors))
+    rgb, names = mix_colors(first, second)
+    mixes = {}
+    for color1, color2, mixed, name_index in zip(first.tolist(), second.tolist(), rgb.tolist(), names.tolist()):
+        name = WHEEL_NAMES[name_index]
+        mixes[(color1, color2)] = (canonical.get(name, mixed), name)
+    return MappingProxyType(mixes)
+
+
+# Every pair of named palette colors, so quiz checks and example lists are a dict lookup
+PAIR_MIXES = build_pair_mixes(COLOR_NAMES)
+
+
+def mix(color1, color2):
+    # (RGB, name) of an even mix of two colors; a dict lookup for palette colors
+    mixed = PAIR_MIXES.get((color1, color2))
+    if mixed is None:
+        rgb, name_index = mix_colors(color1, color2)
+        mixed = (int(rgb), WHEEL_NAMES[int(name_index)])
+    return mixed
+
+
+def primary_mixes(primaries):
+    # (first, second, result name) for each pair of primaries, given as name -> RGB
+    return [(name1, name2, mix(primaries[name1], primaries[name2])[1]) for name1, name2 in combinations(primaries, 2)]
@@ -0,0 +1,215 @@
+from operator import attrgetter
+
+import pyxel
+
+from content_packs import load_pack
+from game_host import draw_static_screen, quit_window
+from palette import PALETTE_SLOTS, PaletteAllocator, starting_colors
+
+# Every key a stage can react to, by pyxel key name
+INPUT_KEYS = ("SPACE", "C", "E", "F", "L", "P", "S", "T", "W")
+
+pack_stages = {}  # (stage class, pack, answer keys) -> the subclass for_pack made for them
+
+
+class ScreenMachine:
+    # Base for the stages: screens are declared as tables instead of if/elif chains in update() and draw().
+    #   TRANSITIONS: screen -> {key: (action, next screen)}; with several keys down the first listed wins
+    #   AUTO_TRANSITIONS: screen -> (action, next screen), followed in the frame the screen is reached
+    #   TIMERS: screen -> (frames, action, next screen), followed once start_time is more than frames old
+    #   TICKS: screen -> method called every frame on that screen with the keys pressed; EXTRA_INPUTS
+    #       lists keys the tick needs beyond the screen's own transitions
+    #   DRAW_HANDLERS: screen -> (method, static); static screens are drawn once and cached
+    # An action is None, a method name or a (method name, argument) pair. An action returning False
+    # cancels its transition, which lets an auto transition act as a guard.
+    # A stage instance is one session and keeps only the attributes its classes list in __slots__.
+    # What every session of a pack reads but never changes, like its colors and names, is set on the
+    # class by load_shared() when the first session starts.
+    # The stage's colors keep their slots of PALETTE. Drawing goes through color_index(), and the
+    # session's own PaletteAllocator (palette) is only made when a color outside PALETTE is first
+    # drawn; from then on it is loaded into Pyxel after each frame's drawing.
+    # A seed passed to a stage seeds its own random.Random, so the same seed replays the same questions.
+    __slots__ = ("exit_callback", "screen", "palette")
+    EXIT_KEY = "E"
+    EXTRA_INPUTS = ()
+    TRANSITIONS = {}
+    AUTO_TRANSITIONS = {}
+    TIMERS = {}
+    TICKS = {}
+    DRAW_HANDLERS = {}
+    CONTENT_PACK = None  # content_packs pack the stage shows by default
+    ANSWER_KEYS = ()  # Keys for a true and a false answer, as used in the tables
+    ATLAS_TEXT = ()  # (text, color) lines the dynamic screens draw through sprite_atlas, beyond the pack's
+    SHOW_SCORE = False  # Draw the session's success and failed counts over every screen
+    PALETTE = None  # palette.Palette of the stage's colors
+    color_names = {}  # Color -> name from the pack, set by shared_data; other colors get the shared names
+
+    def __init_subclass__(cls, **kwargs):
+        # Work out once per stage which keys to poll on each screen: the exit key plus the keys the
+        # screen reacts to. Screens that react to nothing else poll EXIT_INPUTS. Key codes are the
+        # same in pyxel and the headless backend, so they can be looked up here.
+        super().__init_subclass__(**kwargs)
+        cls.EXIT_INPUTS = ((cls.EXIT_KEY, getattr(pyxel, "KEY_" + cls.EXIT_KEY)),)
+        cls.SCREEN_INPUTS = {}
+        for screen in {*cls.TRANSITIONS, *cls.TICKS}:
+            used = {cls.EXIT_KEY, *cls.TRANSITIONS.get(screen, ())}
+            if screen in cls.TICKS:
+                used.update(cls.EXTRA_INPUTS)
+            cls.SCREEN_INPUTS[screen] = tuple((name, getattr(pyxel, "KEY_" + name)) for name in INPUT_KEYS if name in used)
+        # Reads every session attribute at once, base class first, for view_state()
+        slots = [name for klass in reversed(cls.__mro__) for name in klass.__dict__.get("__slots__", ())]
+        cls.SESSION_STATE = attrgetter(*slots)
+
+    @classmethod
+    def for_pack(cls, pack, keys):
+        # The stage for a content pack: cls itself for its own pack, else a subclass showing that
+        # pack, with the pack's answer keys swapped into the tables
+        keys = tuple(keys)
+        if pack == cls.CONTENT_PACK and keys == cls.ANSWER_KEYS:
+            return cls
+        stage = pack_stages.get((cls, pack, keys))
+        if stage is None:
+            swap = dict(zip(cls.ANSWER_KEYS, keys))
+            transitions = {screen: {swap.get(key, key): step for key, step in table.items()} for screen, table in cls.TRANSITIONS.items()}
+            stage = pack_stages[(cls, pack, keys)] = type(f"{cls.__name__}[{pack}]", (cls,), {
+                "__slots__": (),
+                "CONTENT_PACK": pack,
+                "ANSWER_KEYS": keys,
+                "TRANSITIONS": transitions,
+                "EXTRA_INPUTS": tuple(swap.get(key, key) for key in cls.EXTRA_INPUTS),
+            })
+        return stage
+
+    @classmethod
+    def shared_data(cls, content):
+        # Class attributes worked out from the pack's content for every session to share; stages
+        # return immutable values only (tuples, MappingProxyType)
+        return {}
+
+    @classmethod
+    def load_shared(cls):
+        # Set content and shared_data() on the class, once per class
+        if "content" not in cls.__dict__:
+            content = load_pack(cls.CONTENT_PACK)
+            for name, value in cls.shared_data(content).items():
+                setattr(cls, name, value)
+            cls.content = content
+
+    @classmethod
+    def atlas_text(cls):
+        # Lines to warm up in the sprite atlas before the stage starts: ATLAS_TEXT and the pack's fixed
+        # prompt lines. Lines formatted per question are rendered the first time they are drawn.
+        lines = list(cls.ATLAS_TEXT)
+        if cls.CONTENT_PACK is not None:
+            content = load_pack(cls.CONTENT_PACK)
+            lines.extend((line, pyxel.COLOR_WHITE) for line in content["prompt"] if "{" not in line)
+        return lines
+
+    def load_palette(self):
+        # Put the stage's starting colors in Pyxel's palette: black, then PALETTE's colors
+        self.palette = None
+        pyxel.colors.from_list(list(starting_colors(self.PALETTE, PALETTE_SLOTS)))
+
+    def color_index(self, color):
+        # Pyxel palette slot to draw color with
+        slot = self.PALETTE.indices.get(color)
+        if slot is not None:
+            return slot
+        if self.palette is None:
+            self.palette = PaletteAllocator(self.PALETTE, names=self.color_names)
+        return self.palette.index(color)
+
+    def color_name(self, color):
+        name = self.color_names.get(color)
+        return name if name is not None else self.PALETTE.name(color)
+
+    def update(self):
+        # Sample the input once per frame. With nothing pressed, only timers and ticks can do anything.
+        btnp = pyxel.btnp
+        pressed = [name for name, key in self.SCREEN_INPUTS.get(self.screen, self.EXIT_INPUTS) if btnp(key)]
+        if pressed or self.TIMERS or self.TICKS:
+            self.step(pressed)
+
+    def step(self, pressed):
+        # Advance one frame given the names of the keys pressed; headless and batch runs call this directly
+        screen = self.screen
+        if pressed:
+            if self.EXIT_KEY in pressed:
+                self.stop()
+                return
+            table = self.TRANSITIONS.get(self.screen)
+            if table is not None:
+                for key in table:
+                    if key in pressed:
+                        self.follow(*table[key])
+                        break
+
+        if self.TIMERS:
+            timer = self.TIMERS.get(self.screen)
+            if timer is not None and pyxel.frame_count - self.start_time > timer[0]:
+                self.follow(timer[1], timer[2])
+
+        # Auto transitions can chain, but stop after one pass through the table so a cycle cannot spin
+        if self.screen != screen:
+            auto = self.AUTO_TRANSITIONS.get(self.screen)
+            chained = 0
+            while auto is not None and chained < len(self.AUTO_TRANSITIONS) and self.follow(*auto):
+                auto = self.AUTO_TRANSITIONS.get(self.screen)
+                chained += 1
+
+        if self.TICKS:
+            tick = self.TICKS.get(self.screen)
+            if tick is not None:
+                getattr(self, tick)(pressed)
+
+    def follow(self, action, next_screen):
+        if action is not None:
+            if isinstance(action, tuple):
+                result = getattr(self, action[0])(action[1])
+            else:
+                result = getattr(self, action)()
+            if result is False:
+                return False
+        self.screen = next_screen
+        return True
+
+    def view_state(self):
+        # Snapshot of what draw() shows, compared frame to frame by game_host.IdleThrottle. Attributes
+        # that are rebound (screen, scores, the current question) are compared by value; objects
+        # changed in place, like the question scheduler, by identity, so draw() must not depend on them.
+        return self.SESSION_STATE(self)
+
+    def draw(self):
+        pyxel.cls(0)  # Clear screen with black
+
+        handler = self.DRAW_HANDLERS.get(self.screen)
+        if handler is not None:
+            method, static = handler
+            if static:
+                draw_static_screen(getattr(self, method))
+            else:
+                getattr(self, method)()
+
+        self.draw_overlay()
+
+        if self.palette is not None:
+            colors = self.palette.take_upload()
+            if colors is not None:
+                pyxel.colors.from_list(colors)
+
+    def draw_overlay(self):
+        # Drawn on top of every screen
+        if self.SHOW_SCORE:
+            self.draw_score()
+
+    def draw_score(self):
+        # The success and failed counts in the top right corner
+        success_text = f"Success: {self.success}"
+        failed_text = f"Failed: {self.failed}"
+        pyxel.text(pyxel.width - len(success_text) * pyxel.FONT_WIDTH - 5, 5, success_text, pyxel.COLOR_WHITE)
+        pyxel.text(pyxel.width - len(failed_text) * pyxel.FONT_WIDTH - 5, 15, failed_text, pyxel.COLOR_WHITE)
+
+    def stop(self):
+        # The exit key, or the stage finishing: hand the window back and tell whoever started the stage
+        quit_window()
+        self.exit_callback()
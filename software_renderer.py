@@ -0,0 +1,256 @@
+import multiprocessing
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+import headless
+from content_packs import list_packs, stage_class
+
+# Off-screen renderer for screenshots of the stages, e.g. thumbnails of every screen and question for
+# teacher reports and worksheets. SoftwarePyxel is a headless backend that carries out the draw calls
+# the stages make (cls, rect, text and blt, on the screen and the image banks) on NumPy arrays of
+# palette indices instead of a Pyxel window, so frames can be rendered without a display and saved
+# as PNG. Rendering is pixel-for-pixel what Pyxel draws for the calls the stages use: integer
+# coordinates, no camera, clip or pal, and no flipped blt.
+
+FONT_WIDTH = 4
+FONT_HEIGHT = 6
+FIRST_GLYPH = 32  # Pyxel's font covers characters 32-127; it skips any other character without advancing
+
+# Pyxel's built-in font, one glyph per character from FIRST_GLYPH. Each hex digit is a row of the
+# glyph, top row last; bit x of a row is the pixel x from the left.
+FONT_DATA = (
+    0x000000, 0x020222, 0x000055, 0x057575, 0x023636, 0x041241, 0x035252, 0x000022,
+    0x042224, 0x012221, 0x052725, 0x002720, 0x012000, 0x000700, 0x020000, 0x011244,
+    0x035556, 0x022232, 0x071243, 0x034243, 0x044755, 0x034317, 0x075716, 0x011247,
+    0x075757, 0x034757, 0x002020, 0x012020, 0x042124, 0x007070, 0x012421, 0x020247,
+    0x061552, 0x055752, 0x035353, 0x061116, 0x035553, 0x071717, 0x011717, 0x065716,
+    0x055755, 0x072227, 0x025444, 0x055355, 0x071111, 0x055775, 0x055553, 0x025552,
+    0x011353, 0x067552, 0x053753, 0x034216, 0x022227, 0x065555, 0x025555, 0x057755,
+    0x055255, 0x022255, 0x071247, 0x062226, 0x044211, 0x032223, 0x000052, 0x070000,
+    0x000021, 0x065560, 0x035531, 0x061160, 0x065564, 0x063560, 0x022724, 0x247560,
+    0x055531, 0x022202, 0x254404, 0x053351, 0x072223, 0x057770, 0x055530, 0x025520,
+    0x135530, 0x465560, 0x011160, 0x036360, 0x062272, 0x065550, 0x025550, 0x077550,
+    0x052250, 0x246550, 0x072470, 0x062326, 0x022222, 0x032623, 0x000036, 0x077777,
+)
+
+# Pyxel's palette after pyxel.init, until a stage loads its own
+DEFAULT_COLORS = (
+    0x000000, 0x2b335f, 0x7e2072, 0x19959c, 0x8b4852, 0x395c98, 0xa9c1ff, 0xeeeeee,
+    0xd4186c, 0xd38441, 0xe9c35b, 0x70c6a9, 0x7696de, 0xa3a3a3, 0xff9798, 0xedc7b0,
+)
+
+# Glyph masks, (glyph, row, column) -> pixel set
+GLYPHS = ((np.array(FONT_DATA)[:, None] >> np.arange(FONT_WIDTH * FONT_HEIGHT)) & 1).astype(bool).reshape(-1, FONT_HEIGHT, FONT_WIDTH)
+
+text_masks = {}  # Line of text -> its mask, glyphs side by side; the stages draw a few dozen distinct lines
+
+BANK_SIZE = 256
+QUESTIONS = 12  # Questions each batch session answers, alternating the stage's two answer keys
+WORKERS = os.cpu_count() or 1
+CHUNK_SIZE = 8  # Sessions handed to a worker at a time
+PNG_COMPRESSION = 6  # zlib level; 9 makes files a few bytes smaller but takes ten times as long
+
+
+def text_mask(line):
+    mask = text_masks.get(line)
+    if mask is None:
+        glyphs = [ord(char) - FIRST_GLYPH for char in line if FIRST_GLYPH <= ord(char) < FIRST_GLYPH + len(GLYPHS)]
+        mask = np.hstack(GLYPHS[glyphs]) if glyphs else np.zeros((FONT_HEIGHT, 0), bool)
+        text_masks[line] = mask
+    return mask
+
+
+class SoftwareImage:
+    # A pyxel.Image as a (height, width) array of palette indices. banks is the backend's image list,
+    # so blt can take a bank number as pyxel.blt does.
+    def __init__(self, width, height, banks=None):
+        self.width = width
+        self.height = height
+        self.data = np.zeros((height, width), np.uint8)
+        self.banks = banks
+
+    def cls(self, col):
+        self.data.fill(col)
+
+    def pget(self, x, y):
+        return int(self.data[y, x])
+
+    def rect(self, x, y, w, h, col):
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        if x0 < x1 and y0 < y1:
+            self.data[y0:y1, x0:x1] = col
+
+    def text(self, x, y, s, col):
+        # "\n" starts a new line under the first; only the glyphs' set pixels are drawn
+        for row, line in enumerate(s.split("\n")):
+            self.paint(x, y + row * FONT_HEIGHT, text_mask(line), col)
+
+    def paint(self, x, y, mask, col):
+        # Set the pixels of mask placed at (x, y) to col, clipped to the image
+        height, width = mask.shape
+        left, top = max(-x, 0), max(-y, 0)
+        right, bottom = min(width, self.width - x), min(height, self.height - y)
+        if left < right and top < bottom:
+            self.data[y + top:y + bottom, x + left:x + right][mask[top:bottom, left:right]] = col
+
+    def blt(self, x, y, img, u, v, w, h, colkey=None):
+        # Copy the (u, v, w, h) region of img, an image bank number or an image, to (x, y); pixels of
+        # color colkey are left out. Clipped to both images.
+        source = self.banks[img] if isinstance(img, int) else img
+        left, top = max(-x, -u, 0), max(-y, -v, 0)
+        right, bottom = min(w, self.width - x, source.width - u), min(h, self.height - y, source.height - v)
+        if left >= right or top >= bottom:
+            return
+        block = source.data[v + top:v + bottom, u + left:u + right]
+        target = self.data[y + top:y + bottom, x + left:x + right]
+        if colkey is None:
+            target[...] = block
+        else:
+            np.copyto(target, block, where=block != colkey)
+
+
+class SoftwarePyxel(headless.HeadlessPyxel):
+    # Headless backend that rasterises the frames; the screen's pixels are screen.data
+    def __init__(self):
+        super().__init__()
+        self.reset(self.width, self.height)
+
+    def reset(self, width, height):
+        # Blank image banks and screen and the default palette, as pyxel.init leaves them
+        self.colors.from_list(DEFAULT_COLORS)
+        self.images = []
+        self.images.extend(SoftwareImage(BANK_SIZE, BANK_SIZE, self.images) for _ in range(3))
+        self.screen = SoftwareImage(width, height, self.images)
+
+    def init(self, width, height, title="Pyxel", fps=30, **kwargs):
+        super().init(width, height, title, fps, **kwargs)
+        self.reset(width, height)
+
+    def cls(self, col):
+        self.screen.cls(col)
+
+    def pget(self, x, y):
+        return self.screen.pget(x, y)
+
+    def rect(self, x, y, w, h, col):
+        self.screen.rect(x, y, w, h, col)
+
+    def text(self, x, y, s, col):
+        self.screen.text(x, y, s, col)
+
+    def blt(self, x, y, img, u, v, w, h, colkey=None):
+        self.screen.blt(x, y, img, u, v, w, h, colkey)
+
+    def rgb(self):
+        # The screen as a (height, width, 3) array of 8-bit RGB, through the current palette
+        palette = np.array(self.colors, np.uint32)
+        channels = (palette[:, None] >> np.array([16, 8, 0], np.uint32)) & 0xff
+        return channels.astype(np.uint8)[self.screen.data]
+
+    def save_png(self, path, scale=1):
+        write_png(path, self.screen.data, self.colors, scale)
+
+
+def png_chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def write_png(path, pixels, colors, scale=1):
+    # Save a 2D array of palette indices as an indexed PNG, each pixel scale x scale. With Pyxel's
+    # 16 colors two pixels share a byte, which halves what zlib has to compress; a frame takes a few
+    # hundred bytes.
+    if scale > 1:
+        pixels = pixels.repeat(scale, axis=0).repeat(scale, axis=1)
+    height, width = pixels.shape
+    depth = 4 if len(colors) <= 16 else 8
+    if depth == 4:
+        if width % 2:
+            pixels = np.pad(pixels, ((0, 0), (0, 1)))
+        pixels = (pixels[:, 0::2] << 4) | pixels[:, 1::2]
+    rows = np.zeros((height, pixels.shape[1] + 1), np.uint8)  # Each row starts with filter type 0, none
+    rows[:, 1:] = pixels
+    palette = b"".join(color.to_bytes(3, "big") for color in colors)
+    with open(path, "wb") as png_file:
+        png_file.write(b"\x89PNG\r\n\x1a\n"
+                       + png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, depth, 3, 0, 0, 0))
+                       + png_chunk(b"PLTE", palette)
+                       + png_chunk(b"IDAT", zlib.compress(rows.tobytes(), PNG_COMPRESSION))
+                       + png_chunk(b"IEND", b""))
+
+
+def walkthrough(game_class, questions=QUESTIONS):
+    # Inputs that step through every screen of a stage: continue, then an answer, alternating the
+    # stage's true and false keys. A key the current screen does not use is ignored by the stage.
+    inputs = []
+    for question in range(questions + len(game_class.TRANSITIONS)):
+        inputs += ["C", game_class.ANSWER_KEYS[question % 2]]
+    return inputs
+
+
+def render_session(game_class, inputs, directory, name, seed=None, backend=None, scale=1):
+    # Play inputs through a stage and save a PNG of every frame that shows something new, i.e. whose
+    # view_state differs from the last saved frame's. Returns the paths saved.
+    backend = backend or SoftwarePyxel()
+    paths = []
+    with headless.use_backend(backend):
+        game = game_class(lambda: None, seed=seed)
+        shown = None
+        for keys in [()] + list(inputs):
+            backend.press(keys)
+            game.update()
+            if not backend.running:
+                break
+            game.draw()
+            backend.frame_count += 1
+            state = game.view_state()
+            if state != shown:
+                shown = state
+                path = os.path.join(directory, f"{name}-{len(paths):03d}.png")
+                backend.save_png(path, scale)
+                paths.append(path)
+        backend.press(None)
+    return paths
+
+
+worker_backend = None  # One backend per worker process, reused for every session it renders
+
+
+def render_job(job):
+    # Pool task: (pack, seed, questions, directory, scale) -> number of frames saved
+    global worker_backend
+    pack, seed, questions, directory, scale = job
+    if worker_backend is None:
+        worker_backend = SoftwarePyxel()
+    game_class = stage_class(pack)
+    return len(render_session(game_class, walkthrough(game_class, questions), directory, f"{pack}-{seed:05d}", seed, worker_backend, scale))
+
+
+def export(directory, sessions, packs=None, questions=QUESTIONS, workers=WORKERS, scale=1):
+    # Render sessions seeded 0..sessions-1 of every pack over a pool of worker processes; returns
+    # the number of frames saved. Workers are spawned like the dashboard's, so nothing is inherited.
+    os.makedirs(directory, exist_ok=True)
+    jobs = [(pack, seed, questions, directory, scale) for pack in (packs or list_packs()) for seed in range(sessions)]
+    if workers <= 1:
+        return sum(map(render_job, jobs))
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        return sum(pool.imap_unordered(render_job, jobs, CHUNK_SIZE))
+
+
+# Batch screenshots of every pack, e.g. 1000 sessions each on 8 worker processes:
+# python software_renderer.py screenshots 1000 8
+def main(directory="screenshots", sessions=100, workers=WORKERS):
+    started = time.perf_counter()
+    frames = export(directory, sessions, workers=workers)
+    elapsed = time.perf_counter() - started
+    print(f"{frames:,} frames from {sessions:,} sessions per pack in {elapsed:.1f} s "
+          f"({frames / elapsed:,.0f} frames/s on {workers} workers) -> {directory}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2], *map(int, sys.argv[2:4]))
@@ -0,0 +1,134 @@
+import random
+from array import array
+
+# Leitner boxes: how many questions later an item comes back after reaching each box
+BOX_INTERVALS = (1, 3, 7, 15, 31)
+
+# A question's place in line is one integer, so comparing keys compares (due turn, box, sequence)
+DUE_SHIFT = 40
+BOX_SHIFT = 32
+
+pool_positions = {}  # Pool -> ({question: position}, questions in position order), shared by every scheduler over that pool
+
+
+def positions_of(pool):
+    # A question listed twice keeps its first position, as the dict of boxes this replaced did
+    shared = pool_positions.get(pool)
+    if shared is None:
+        positions = {}
+        for question in pool:
+            positions.setdefault(question, len(positions))
+        shared = pool_positions[pool] = (positions, tuple(positions))
+    return shared
+
+
+class LeitnerScheduler:
+    # Spaced-repetition dealer over a question pool. Every question sits in a Leitner box; a correct
+    # answer moves it up a box so it comes back later, a miss drops it to box 0 so it comes back soon.
+    # A session holds only flat arrays indexed by the question's position in the shared pool: its box,
+    # its successes and failures, and its key in line. The positions of the questions waiting in line
+    # form a binary heap ordered by their keys, so deal() and record() are O(log n) however large the
+    # pool; a dealt question is out of the heap until it is put back.
+    __slots__ = ("questions", "positions", "intervals", "turn", "boxes", "history", "keys", "heap", "sequence", "pending", "last")
+
+    def __init__(self, pool, rng=None, intervals=BOX_INTERVALS):
+        rng = rng if rng is not None else random.Random()
+        self.positions, self.questions = positions_of(tuple(pool))
+        self.intervals = intervals
+        self.turn = 0
+        self.boxes = bytearray(len(self.questions))
+        self.history = array("I", bytes(8 * len(self.questions)))  # [successes, failures] per question
+        self.pending = None  # Dealt but not yet answered
+        self.last = None
+
+        # Everything starts due now, in a random order
+        order = list(self.questions)
+        rng.shuffle(order)
+        self.keys = array("Q", bytes(8 * len(order)))
+        for place, question in enumerate(order):
+            self.keys[self.positions[question]] = place
+        # Sorted by key, so already a heap. Built from a list so the array is sized exactly, and two
+        # bytes a position for any pool under 65536 questions
+        self.heap = array("H" if len(order) <= 0xffff else "I", [self.positions[question] for question in order])
+        self.sequence = len(order)  # Tie-breaker so two questions never share a key
+
+    def push(self, question, due):
+        # Put a dealt question back in line
+        self.sequence += 1
+        position = self.positions[question]
+        self.keys[position] = (due << DUE_SHIFT) | (self.boxes[position] << BOX_SHIFT) | self.sequence
+        self.heap.append(position)
+        self.sift_up(len(self.heap) - 1)
+
+    def sift_up(self, index):
+        heap, keys = self.heap, self.keys
+        position = heap[index]
+        key = keys[position]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if keys[heap[parent]] <= key:
+                break
+            heap[index] = heap[parent]
+            index = parent
+        heap[index] = position
+
+    def sift_down(self, index):
+        heap, keys = self.heap, self.keys
+        size = len(heap)
+        position = heap[index]
+        key = keys[position]
+        child = 2 * index + 1
+        while child < size:
+            if child + 1 < size and keys[heap[child + 1]] < keys[heap[child]]:
+                child += 1
+            if keys[heap[child]] >= key:
+                break
+            heap[index] = heap[child]
+            index = child
+            child = 2 * index + 1
+        heap[index] = position
+
+    def deal(self):
+        # A question dealt but never answered goes back in line for the next turn
+        if self.pending is not None:
+            self.push(self.pending, self.turn + 1)
+        self.turn += 1
+
+        heap = self.heap
+        position = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.sift_down(0)
+        if self.questions[position] == self.last and heap:
+            # Don't show the same question twice in a row if anything else is available: deal the
+            # next in line and leave this one in its place
+            position, heap[0] = heap[0], position
+            self.sift_down(0)
+
+        question = self.questions[position]
+        self.pending = self.last = question
+        return question
+
+    def record(self, question, correct):
+        # Feed back the result from check_answer and reschedule the question
+        position = self.positions[question]
+        if correct:
+            self.history[2 * position] += 1
+            self.boxes[position] = min(self.boxes[position] + 1, len(self.intervals) - 1)
+        else:
+            self.history[2 * position + 1] += 1
+            self.boxes[position] = 0
+
+        if question == self.pending:
+            self.pending = None
+            self.push(question, self.turn + self.intervals[self.boxes[position]])
+
+    def batch(self, count):
+        # Deal count questions assuming every one is answered correctly, for headless runs
+        questions = []
+        for _ in range(count):
+            question = self.deal()
+            self.record(question, True)
+            questions.append(question)
+        return questions
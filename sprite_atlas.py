@@ -0,0 +1,114 @@
+from collections import deque
+
+import pyxel
+
+# Sprites for the parts of the dynamic screens that take several primitive calls to draw: text lines
+# and rows of color boxes. Each sprite is rendered once into an image bank and then drawn with one
+# blt. They are packed in shelves into the parts of the banks that the static screen cache leaves
+# free (see game_host.draw_static_screen): the strip right of the two stacked screens, and the rows
+# under them. A lone box is left to pyxel.rect, which is cheaper than the blt that would replace it.
+#
+# Sprites are opaque, so they are only drawn where the screen is otherwise black. A sprite is
+# rendered by a function taking (canvas, x, y), where canvas is the pyxel module or a pyxel.Image;
+# both have the same rect() and text(). Keys should include the palette indices drawn, so a color
+# moved to another slot by the stage's PaletteAllocator gets a new sprite instead of a stale one.
+
+# (bank, u, v, width, height) of each free region; static screens use x 0-159, y 0-239 of every bank
+ATLAS_REGIONS = tuple((bank, 160, 0, 96, 256) for bank in range(3)) + tuple((bank, 0, 240, 160, 16) for bank in range(3))
+WARM_UP_BUDGET = 8  # Queued sprites rendered per warm_up() call, so a long queue is spread over frames
+
+
+class SpriteAtlas:
+    def __init__(self, regions=ATLAS_REGIONS):
+        self.regions = regions
+        self.reset()
+
+    def reset(self):
+        # The image banks start blank after pyxel.init, so forget every sprite and start packing again
+        self.sprites = {}  # Key -> (bank, u, v, width, height), or False for a sprite that did not fit
+        self.shelves = [[] for _ in self.regions]  # Per region: [v, height, next free u] of each shelf
+        self.next_v = [region[2] for region in self.regions]
+        self.pending = deque()  # (key, width, height, render) waiting for warm_up()
+
+    def place(self, width, height):
+        # Free (bank, u, v) for a sprite: the first shelf of its height with room, else a new shelf
+        for index, (bank, u, v, region_width, region_height) in enumerate(self.regions):
+            if width > region_width:
+                continue
+            for shelf in self.shelves[index]:
+                if shelf[1] == height and shelf[2] + width <= u + region_width:
+                    shelf[2] += width
+                    return bank, shelf[2] - width, shelf[0]
+            if self.next_v[index] + height <= v + region_height:
+                self.shelves[index].append([self.next_v[index], height, u + width])
+                self.next_v[index] += height
+                return bank, u, self.next_v[index] - height
+        return None
+
+    def sprite(self, key, width, height, render):
+        # blt arguments after x, y for the sprite for key, rendered into the atlas on first use;
+        # False once the atlas is full
+        if key in self.sprites:
+            return self.sprites[key]
+        place = self.place(width, height)
+        if place is None:
+            sprite = False
+        else:
+            bank, u, v = place
+            image = pyxel.images[bank]
+            image.rect(u, v, width, height, 0)
+            render(image, u, v)
+            sprite = (bank, u, v, width, height)
+        self.sprites[key] = sprite
+        return sprite
+
+    def blit(self, x, y, key):
+        # Draw an already rendered sprite in one call; False if key has not been rendered or did not fit
+        sprite = self.sprites.get(key)
+        if sprite:
+            pyxel.blt(x, y, *sprite)
+            return True
+        return False
+
+    def draw(self, x, y, key, width, height, render):
+        # Draw a sprite, rendering it first if needed; directly to the screen once the atlas is full
+        sprite = self.sprite(key, width, height, render)
+        if sprite:
+            pyxel.blt(x, y, *sprite)
+        else:
+            render(pyxel, x, y)
+
+    def queue(self, key, width, height, render):
+        # Render a sprite ahead of its first use, during a later warm_up()
+        if key not in self.sprites:
+            self.pending.append((key, width, height, render))
+
+    def warm_up(self, budget=WARM_UP_BUDGET):
+        # Render up to budget queued sprites; called every frame by GameHost, so cheap when nothing is queued
+        while self.pending and budget > 0:
+            self.sprite(*self.pending.popleft())
+            budget -= 1
+
+
+# The atlas shared by every stage in the window
+atlas = SpriteAtlas()
+
+
+def text_sprite(text, col):
+    # atlas.draw/queue arguments after x, y for a line of text, keyed by (text, col)
+    return (text, col), len(text) * pyxel.FONT_WIDTH, pyxel.FONT_HEIGHT, lambda canvas, x, y: canvas.text(x, y, text, col)
+
+
+def draw_text(x, y, text, col):
+    # Same as pyxel.text on a black background. Drawn every frame, so the rendered case is kept inline.
+    sprite = atlas.sprites.get((text, col))
+    if sprite:
+        pyxel.blt(x, y, *sprite)
+    else:
+        atlas.draw(x, y, *text_sprite(text, col))
+
+
+def queue_text(lines):
+    # Warm up (text, color) lines, e.g. a stage's prompts before it starts
+    for text, col in lines:
+        atlas.queue(*text_sprite(text, col))
@@ -0,0 +1,231 @@
+import random
+from types import MappingProxyType
+
+import pyxel
+
+from game_host import init_window, report_answer
+from color_classes import is_warm
+from palette import WARM_COOL_PALETTE
+from question_pool import question_pool
+from screen_machine import ScreenMachine
+from spaced_repetition import LeitnerScheduler
+from sprite_atlas import draw_text
+
+
+def warm_cool_data(content):
+    # Class data shared by every session of the stage and its quiz: warm and cool colors as 24-bit
+    # RGB values, and the pack's name for each color
+    colors = content["colors"]
+    return {
+        "warm_colors_rgb": tuple(colors[name] for name in content["warm"]),
+        "cool_colors_rgb": tuple(colors[name] for name in content["cool"]),
+        "color_names": MappingProxyType({rgb: name for name, rgb in colors.items()}),
+    }
+
+# Define the warm and cool colors game
+class WarmCoolColorTheoryGame(ScreenMachine):
+    # Screens: 0 warm colors, 1 quiz instructions, 2 the nested quiz, which gets this stage's keys every frame
+    CONTENT_PACK = "warm_cool"
+    ANSWER_KEYS = ("L", "W")
+    EXTRA_INPUTS = ("C", "SPACE", "L", "W")
+    TRANSITIONS = {
+        0: {"C": (None, 1), "SPACE": (None, 1)},
+        1: {"C": ("start_quiz", 2), "SPACE": ("start_quiz", 2)},
+    }
+    TICKS = {2: "update_quiz"}
+    DRAW_HANDLERS = {
+        0: ("draw_warm_colors", True),
+        1: ("draw_quiz_instructions", True),
+        2: ("draw_quiz", False),
+    }
+    PALETTE = WARM_COOL_PALETTE  # Black, then warm and cool colors; others on demand
+    __slots__ = ("quiz_seed", "quiz_game")
+
+    @classmethod
+    def shared_data(cls, content):
+        return warm_cool_data(content)
+
+    def __init__(self, exit_callback, seed=None):
+        self.exit_callback = exit_callback
+        self.quiz_seed = random.Random(seed).getrandbits(32)  # The quiz's seed, so one seed replays the whole stage
+        self.load_shared()  # Colors, names and prompts, shared with the quiz
+        init_window(self.content["window_title"])
+        pyxel.cls(0)  # Clear screen with black
+
+        self.load_palette()
+
+        self.screen = 0  # Track which screen to display
+        self.quiz_game = None  # Placeholder for the quiz game instance
+
+    def start_quiz(self):
+        quiz_class = QuizGame.for_pack(self.CONTENT_PACK, self.ANSWER_KEYS)  # The quiz shows this stage's pack
+        self.quiz_game = quiz_class(self.stop, seed=self.quiz_seed)  # Pass the stop method as exit_callback
+
+    @classmethod
+    def atlas_text(cls):
+        # The dynamic screens are the quiz's
+        return QuizGame.for_pack(cls.CONTENT_PACK, cls.ANSWER_KEYS).atlas_text()
+
+    def update_quiz(self, pressed):
+        self.quiz_game.step(pressed)
+
+    def draw_quiz(self):
+        self.quiz_game.draw()
+
+    def view_state(self):
+        # The nested quiz changes in place, so include its own snapshot
+        return super().view_state(), self.quiz_game.view_state() if self.quiz_game is not None else None
+
+    def draw_warm_colors(self):
+        pyxel.cls(0)  # Clear screen with black
+        
+        # Display warm colors category
+        pyxel.text(10, 5, "Warm Colors:", pyxel.COLOR_WHITE)
+        for idx, color in enumerate(self.warm_colors_rgb):
+            y = 20 + idx * 15  # Vertical position for each color box
+            self.draw_color_box(10, y, color)
+            pyxel.text(35, y + 2, self.color_name(color), pyxel.COLOR_WHITE)
+
+        pyxel.text(40, 110, "Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE)
+
+    def draw_quiz_instructions(self):
+        pyxel.cls(0)  # Clear screen with black
+        # Display quiz instructions
+        pyxel.text(10, 5, "Quiz Instructions:", pyxel.COLOR_WHITE)
+        for index, line in enumerate(self.content["instructions"]):
+            pyxel.text(10, 20 + index * 15, line, pyxel.COLOR_WHITE)
+        pyxel.text(10, 110, "Press 'C' or 'SPACE' to start quiz", pyxel.COLOR_WHITE)
+
+    def draw_color_box(self, x, y, color):
+        box_width = 20
+        box_height = 10
+        pyxel.rect(x, y, box_width, box_height, self.color_index(color))  # Use the color for the box
+
+class QuizGame(ScreenMachine):
+    # Screens: 0 warm colors, 1 cool colors, 2 instructions, 3 question, 4 feedback
+    CONTENT_PACK = "warm_cool"
+    ANSWER_KEYS = ("L", "W")
+    TRANSITIONS = {
+        0: {"C": (None, 1), "SPACE": (None, 1)},
+        1: {"C": (None, 2), "SPACE": (None, 2)},
+        2: {"C": ("restart_timer", 3), "SPACE": ("restart_timer", 3)},
+        3: {"L": (("select_answer", True), 4), "W": (("select_answer", False), 4)},
+        4: {"C": ("new_question", 3), "SPACE": ("new_question", 3)},
+    }
+    DRAW_HANDLERS = {
+        0: ("draw_warm_colors", True),
+        1: ("draw_cool_colors", True),
+        2: ("draw_quiz_instructions", True),
+        3: ("draw_quiz", False),
+        4: ("draw_feedback", False),
+    }
+    SHOW_SCORE = True
+    PALETTE = WARM_COOL_PALETTE  # Same as WarmCoolColorTheoryGame, so the stage colors keep their slots
+    ATLAS_TEXT = (("Correct!", pyxel.COLOR_GREEN), ("Incorrect!", pyxel.COLOR_RED), ("Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE))
+    __slots__ = ("questions", "current_color", "correct_answer", "answer_selected", "success", "failed", "start_time")
+
+    @classmethod
+    def shared_data(cls, content):
+        return warm_cool_data(content)
+
+    def __init__(self, exit_callback, seed=None):
+        self.exit_callback = exit_callback
+        rng = random.Random(seed)
+        self.load_shared()  # The same pack as WarmCoolColorTheoryGame, so both agree on warm and cool
+        pyxel.cls(0)  # Clear screen with black
+
+        self.load_palette()
+
+        # Warm and cool colors dealt by the same scheduler as the other stages' quizzes
+        self.questions = LeitnerScheduler(question_pool(self.CONTENT_PACK, lambda: self.warm_colors_rgb + self.cool_colors_rgb), rng)
+
+        self.current_color = self.get_random_color()
+        self.correct_answer = self.is_warm_color(self.current_color)
+        self.answer_selected = None
+        self.success = 0
+        self.failed = 0  # Initialize failed count
+        self.start_time = pyxel.frame_count
+
+        self.screen = 0  # Track which screen to display
+
+    def restart_timer(self):
+        # The first question was dealt in __init__; time the answer from when it is shown
+        self.start_time = pyxel.frame_count
+
+    def new_question(self):
+        self.current_color = self.get_random_color()
+        self.correct_answer = self.is_warm_color(self.current_color)
+        self.answer_selected = None
+        self.start_time = pyxel.frame_count
+
+    def select_answer(self, answer):
+        self.answer_selected = answer
+        self.check_answer()
+
+    def draw_warm_colors(self):
+        pyxel.cls(0)  # Clear screen with black
+        # Display warm colors category
+        pyxel.text(10, 5, "Warm Colors:", pyxel.COLOR_WHITE)
+        for idx, color in enumerate(self.warm_colors_rgb):
+            y = 20 + idx * 15  # Vertical position for each color box
+            self.draw_color_box(10, y, color)
+            pyxel.text(35, y + 2, self.color_name(color), pyxel.COLOR_WHITE)
+        pyxel.text(10, 110, "Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE)
+
+    def draw_cool_colors(self):
+        pyxel.cls(0)  # Clear screen with black
+        # Display cool colors category
+        pyxel.text(10, 5, "Cool Colors:", pyxel.COLOR_WHITE)
+        for idx, color in enumerate(self.cool_colors_rgb):
+            y = 20 + idx * 15  # Vertical position for each color box
+            self.draw_color_box(10, y, color)
+            pyxel.text(35, y + 2, self.color_name(color), pyxel.COLOR_WHITE)
+        pyxel.text(10, 110, "Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE)
+
+    def draw_quiz_instructions(self):
+        pyxel.cls(0)  # Clear screen with black
+        # Display quiz instructions
+        pyxel.text(10, 5, "Quiz Instructions:", pyxel.COLOR_WHITE)
+        for index, line in enumerate(self.content["instructions"]):
+            pyxel.text(10, 20 + index * 15, line, pyxel.COLOR_WHITE)
+        pyxel.text(10, 110, "Press 'C' or 'SPACE' to start quiz", pyxel.COLOR_WHITE)
+
+    def draw_quiz(self):
+        # Centering the quiz text and color boxes
+        prompt_lines = self.content["prompt"]
+        y_start = (pyxel.height - len(prompt_lines) * pyxel.FONT_HEIGHT) // 2 - 10
+        for index, line in enumerate(prompt_lines):
+            text_width = len(line) * pyxel.FONT_WIDTH
+            x = (pyxel.width - text_width) // 2
+            draw_text(x, y_start + index * pyxel.FONT_HEIGHT, line, pyxel.COLOR_WHITE)
+
+        # Draw the color box for the current question
+        y_boxes = y_start + len(prompt_lines) * pyxel.FONT_HEIGHT + 10
+        self.draw_color_box(44, y_boxes, self.current_color)
+
+    def draw_feedback(self):
+        # Centering the feedback text
+        if self.answer_selected is not None:
+            feedback_text = "Correct!" if self.answer_selected == self.correct_answer else "Incorrect!"
+            draw_text(20, 40, feedback_text, pyxel.COLOR_GREEN if self.answer_selected == self.correct_answer else pyxel.COLOR_RED)
+            draw_text(20, 60, "Press 'C' or 'SPACE' to continue", pyxel.COLOR_WHITE)
+
+    def draw_color_box(self, x, y, color):
+        box_width = 20
+        box_height = 10
+        pyxel.rect(x, y, box_width, box_height, self.color_index(color))  # Use the color for the box
+
+    def check_answer(self):
+        correct = self.answer_selected == self.correct_answer
+        if correct:
+            self.success += 1
+        else:
+            self.failed += 1
+        self.questions.record(self.current_color, correct)
+        report_answer(self.content["results_name"], (self.current_color,), self.answer_selected, correct, pyxel.frame_count - self.start_time)
+
+    def get_random_color(self):
+        return self.questions.deal()
+
+    def is_warm_color(self, color):
+        return is_warm(color)